@@ -1,106 +1,89 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import altair as alt
 import datetime
 import math
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+import profiling
+from loader import DEFAULT_SNAPSHOT_PATH, FULL_SYNC_INTERVAL, DatasetHolder, SheetGroup, SheetSync
+from profiling import payload_bytes, profiler, timed
+from query import (
+    BULAN, MAX_SERIES, TAG_LIMITS, backlog_series, cache_stats, chart_resolution, compare_series,
+    date_window, detail_page, detail_positions, ranked, resolution_by, resolution_stats,
+    search_options, service_options, top_n, totals,
+)
+from sheets import build_sources
 
 st.set_page_config(page_title="Dashboard Detail Tiket", layout="wide")
 
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
-
-def _get_sheet_title_by_gid(service, spreadsheet_id: str, sheet_gid: int) -> str:
-    meta = service.spreadsheets().get(
-        spreadsheetId=spreadsheet_id,
-        fields="sheets(properties(sheetId,title))",
-    ).execute()
-
-    for s in meta.get("sheets", []):
-        props = s.get("properties", {})
-        if int(props.get("sheetId", -1)) == int(sheet_gid):
-            return props.get("title")
-
-    raise ValueError(f"GID sheet {sheet_gid} tidak ditemukan di spreadsheet {spreadsheet_id}")
+# waktu tiap bagian halaman dicatat per rerun (lihat panel admin di sidebar)
+profiling.start_rerun()
+profiling.mark("load")
 
 # ==================================
 # 🔄 Refresh data manual
 # ==================================
-if st.button("🔄 Refresh Data dari Google Sheet"):
-    st.cache_data.clear()
-    st.success("✅ Data berhasil di-refresh. Silakan tekan Ctrl+R untuk memuat ulang.")
+col_refresh, col_full = st.columns([3, 1])
+refresh_clicked = col_refresh.button("🔄 Refresh Data dari Google Sheet")
+full_reload_clicked = col_full.button("♻️ Muat Ulang Penuh")
 
 # ==================================
 # 📥 Load data
 # ==================================
-@st.cache_data
-def load_data():
-    # ambil dari Streamlit Secrets
-    spreadsheet_id = st.secrets["SPREADSHEET_ID"]
-    sheet_gid = int(st.secrets["SHEET_GID"])
-
-    creds = Credentials.from_service_account_info(
-        st.secrets["gcp_service_account"],
-        scopes=SCOPES,
-    )
-    service = build("sheets", "v4", credentials=creds, cache_discovery=False)
-
-    sheet_title = _get_sheet_title_by_gid(service, spreadsheet_id, sheet_gid)
-
-    values = (
-        service.spreadsheets()
-        .values()
-        .get(spreadsheetId=spreadsheet_id, range=sheet_title)
-        .execute()
-        .get("values", [])
-    )
-
-    if not values:
-        return pd.DataFrame()
-
-    header = [h.strip() for h in values[0]]
-    rows = values[1:]
-
-    # rapihin panjang kolom biar konsisten
-    max_len = len(header)
-    fixed_rows = []
-    for r in rows:
-        r = r[:max_len] + [""] * max(0, max_len - len(r))
-        fixed_rows.append(r)
-
-    df = pd.DataFrame(fixed_rows, columns=header)
-
-    # buang baris kosong (Sheets API sering ngasih empty string)
-    df = df.replace({"": None}).dropna(how="all")
-
-    # parse tanggal kalau kolomnya ada
-    if "Created Date" in df.columns:
-        df["Created Date"] = pd.to_datetime(df["Created Date"], errors="coerce", dayfirst=True)
-    if "Finish Date" in df.columns:
-        df["Finish Date"] = pd.to_datetime(df["Finish Date"], errors="coerce", dayfirst=True)
-
-    return df
-
-df = load_data()
+# snapshot lokal supaya cold start tidak perlu nunggu Sheets API
+SNAPSHOT_PATH = st.secrets.get("SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+SNAPSHOT_TTL = int(st.secrets.get("SNAPSHOT_TTL_SECONDS", 15 * 60))
+FULL_SYNC_SECONDS = int(st.secrets.get("FULL_SYNC_SECONDS", FULL_SYNC_INTERVAL))
+
+@st.cache_resource
+def get_dataset_holder():
+    # satu holder per proses server, dipakai bareng semua session
+    group = SheetGroup([SheetSync(source) for source in build_sources(st.secrets)])
+    group.restore_snapshot(SNAPSHOT_PATH)
+
+    # data di-refresh di background tiap SNAPSHOT_TTL detik (langsung kalau snapshot sudah basi);
+    # tiap FULL_SYNC_SECONDS, dan sekali setelah restore snapshot, refresh-nya full load
+    holder = DatasetHolder(group, SNAPSHOT_PATH, SNAPSHOT_TTL, FULL_SYNC_SECONDS)
+    holder.start()
+    return holder
+
+def load_data(refresh=False, full=False):
+    # refresh manual tidak mengosongkan data session lain; mereka tetap baca versi
+    # lama sampai versi baru selesai dibangun
+    holder = get_dataset_holder()
+    if refresh or full:
+        return holder.refresh(full=full)
+    return holder.get()
+
+dataset = load_data(refresh=refresh_clicked, full=full_reload_clicked)
+df = dataset.df
+
+if refresh_clicked or full_reload_clicked:
+    st.success(f"✅ Data berhasil di-refresh ({get_dataset_holder().sync.last_delta} baris diperbarui).")
+
+unparsed_dates = get_dataset_holder().sync.unparsed_counts()
+if unparsed_dates:
+    st.caption("⚠️ " + ", ".join(f"{n} nilai {col}" for col, n in unparsed_dates.items())
+               + " tidak terbaca sebagai tanggal dan tidak ikut di filter tanggal.")
 
 # ==================================
 # 🎛️ Sidebar filters
 # ==================================
+profiling.mark("sidebar")
 with st.sidebar:
     st.header("🔍 Filter")
 
-    service_options = ["All"] + sorted(df["Services"].dropna().unique().tolist())
-    service_filter = st.selectbox("📄 Pilih Services", options=service_options)
+    service_filter = st.selectbox("📄 Pilih Services", options=["All"] + service_options(dataset))
 
     # Mode filter
     filter_type = st.radio("🎯 Mode Filter Tanggal", ["Per Hari", "Per Bulan", "Per Tahun"], horizontal=True)
 
+    date_range = selected_year = selected_month = selected_months = None
     if filter_type == "Per Hari":
-        min_date = df["Created Date"].min().date()
-        max_date = df["Created Date"].max().date()
+        min_date = dataset.dates.min().date()
+        max_date = dataset.dates.max().date()
         # Ambil tahun dan bulan pertama dari data
-        first_date = df["Created Date"].min().date()
-        default_start = datetime.date(first_date.year, first_date.month, 1)
+        default_start = datetime.date(min_date.year, min_date.month, 1)
 
         # Hanya set default 1 hari saja
         date_range = st.date_input(
@@ -111,90 +94,57 @@ with st.sidebar:
         )
 
     elif filter_type == "Per Bulan":
-        tahun_opsi = sorted(df["Created Date"].dt.year.unique())
+        tahun_opsi = dataset.dates.years()
         selected_year = st.selectbox("📅 Pilih Tahun", options=tahun_opsi)
 
-        bulan_opsi = {
-            1: "Januari", 2: "Februari", 3: "Maret", 4: "April", 5: "Mei", 6: "Juni",
-            7: "Juli", 8: "Agustus", 9: "September", 10: "Oktober", 11: "November", 12: "Desember"
-        }
-
-        bulan_di_data = df[df["Created Date"].dt.year == selected_year]["Created Date"].dt.month.unique()
-        bulan_tersedia = [b for b in bulan_opsi if b in bulan_di_data]
+        bulan_tersedia = dataset.dates.months_by_year[selected_year]
 
-        selected_month = st.selectbox("📅 Pilih Bulan", options=bulan_tersedia, format_func=lambda x: bulan_opsi[x])
-        start_date = pd.to_datetime(f"{selected_year}-{selected_month:02d}-01")
-        end_date = pd.to_datetime(f"{selected_year}-{selected_month:02d}-01") + pd.offsets.MonthEnd(1)
-        end_date += pd.Timedelta(days=1)
+        selected_month = st.selectbox("📅 Pilih Bulan", options=bulan_tersedia, format_func=lambda x: BULAN[x])
 
     elif filter_type == "Per Tahun":
-        tahun_opsi = sorted(df["Created Date"].dt.year.unique())
+        tahun_opsi = dataset.dates.years()
         selected_year = st.selectbox("📅 Pilih Tahun", options=tahun_opsi)
 
-        bulan_opsi = {
-            1: "Januari", 2: "Februari", 3: "Maret", 4: "April", 5: "Mei", 6: "Juni",
-            7: "Juli", 8: "Agustus", 9: "September", 10: "Oktober", 11: "November", 12: "Desember"
-        }
-
-        bulan_di_data = df[df["Created Date"].dt.year == selected_year]["Created Date"].dt.month.unique()
-        bulan_tersedia = [b for b in bulan_opsi if b in bulan_di_data]
+        bulan_tersedia = dataset.dates.months_by_year[selected_year]
 
         selected_months = st.multiselect("📅 Pilih Bulan", options=bulan_tersedia,
-                                default=bulan_tersedia, format_func=lambda x: bulan_opsi[x])
-        if selected_months:
-            start_month = min(selected_months)
-            end_month = max(selected_months)
-            start_date = pd.to_datetime(f"{selected_year}-{start_month:02d}-01")
-            end_date = pd.to_datetime(f"{selected_year}-{end_month:02d}-01") + pd.offsets.MonthEnd(1)
-            end_date += pd.Timedelta(days=1)
-        else:
+                                default=bulan_tersedia, format_func=lambda x: BULAN[x])
+        if not selected_months:
             st.warning("⚠️ Silakan pilih minimal satu bulan.")
             st.stop()
 
 # ==================================
 # 📊 Filter data
 # ==================================
-if filter_type == "Per Hari":
-    if isinstance(date_range, tuple) and len(date_range) == 2:
-        start_date = pd.to_datetime(date_range[0])
-        end_date = pd.to_datetime(date_range[1]) + pd.Timedelta(days=1)
-    else:
-        st.warning("⚠️ Silakan pilih rentang tanggal yang lengkap (mulai dan akhir).")
-        st.stop()
-
-elif filter_type == "Per Bulan":
-    start_date = pd.to_datetime(f"{selected_year}-{selected_month:02d}-01")
-    end_date = pd.to_datetime(f"{selected_year}-{selected_month:02d}-01") + pd.offsets.MonthEnd(1)
-    end_date += pd.Timedelta(days=1)
-
-elif filter_type == "Per Tahun":
-    if selected_months:
-        start_month = min(selected_months)
-        end_month = max(selected_months)
-        start_date = pd.to_datetime(f"{selected_year}-{start_month:02d}-01")
-        end_date = pd.to_datetime(f"{selected_year}-{end_month:02d}-01") + pd.offsets.MonthEnd(1)
-        end_date += pd.Timedelta(days=1)
-    else:
-        st.warning("⚠️ Pilih minimal satu bulan untuk mode Per Tahun.")
-        st.stop()
+# rentang [start_date, end_date) dihitung sekali di sini untuk semua mode
+window = date_window(filter_type, date_range, selected_year, selected_month, selected_months)
+if window is None:
+    # Per Tahun tanpa bulan sudah berhenti di sidebar
+    st.warning("⚠️ Silakan pilih rentang tanggal yang lengkap (mulai dan akhir).")
+    st.stop()
+start_date, end_date = window
 
 # ==================================
 # 🧾 Tampilan Ringkasan & Analisis
 # ==================================
+profiling.mark("ringkasan")
 st.title("📊 Dashboard Detail Tiket")
-filtered_df = df[(df["Created Date"] >= start_date) & (df["Created Date"] < end_date)]
-
-if service_filter != "All":
-    filtered_df = filtered_df[filtered_df["Services"] == service_filter]
+# data sudah terurut per Created Date -> cukup binary search, tanpa mask & copy
+# ringkasan, top-N & grafik dihitung dari cube agregat (bukan scan baris tiket).
+# Semua view turunan di-memoize per (versi data, rentang tanggal, service, company),
+# jadi ganti satu widget tidak menghitung ulang yang lain.
+service_scope = None if service_filter == "All" else service_filter
+company_scope = None
 
 
 if service_filter == "All":
     st.subheader("📈 Ringkasan Total Tiket per Kategori")
+    service_totals = totals(dataset, "Services", start_date, end_date)
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Issue", len(filtered_df[filtered_df["Services"] == "Issue"]))
-    col2.metric("Total Request", len(filtered_df[filtered_df["Services"] == "Request"]))
-    col3.metric("Total Question", len(filtered_df[filtered_df["Services"] == "Question"]))
-    col4.metric("Total Task", len(filtered_df[filtered_df["Services"] == "Task"]))
+    col1.metric("Total Issue", int(service_totals.get("Issue", 0)))
+    col2.metric("Total Request", int(service_totals.get("Request", 0)))
+    col3.metric("Total Question", int(service_totals.get("Question", 0)))
+    col4.metric("Total Task", int(service_totals.get("Task", 0)))
 
     st.markdown("---")
     st.subheader("📌 Top 5 Tags untuk Setiap Jenis Services")
@@ -206,9 +156,8 @@ if service_filter == "All":
         with cols[i % 4]:
             st.write("")
             st.markdown(f"**🔸 Top 5 Tags untuk {kategori}:**")
-            sub_df = filtered_df[filtered_df["Services"] == kategori]
-            if "Tags" in sub_df.columns and not sub_df.empty:
-                top_tags = sub_df["Tags"].value_counts().head(5)
+            if "Tags" in df.columns and service_totals.get(kategori, 0) > 0:
+                top_tags = top_n(dataset, "Tags", start_date, end_date, kategori, limit=5)
                 for idx, (tag, count) in enumerate(top_tags.items(), 1):
                     st.write(f"{idx}. {tag} ({count} tiket)")
             else:
@@ -223,10 +172,8 @@ if service_filter == "All":
         with cols[i % 2]:
             st.write("")
             st.markdown(f"**🏢 Top 5 Company berdasarkan {service}:**")
-            df_service = filtered_df[filtered_df["Services"] == service]
-            
-            if not df_service.empty and "Company" in df_service.columns:
-                top_companies = df_service["Company"].value_counts().head(5)
+            if service_totals.get(service, 0) > 0 and "Company" in df.columns:
+                top_companies = top_n(dataset, "Company", start_date, end_date, service, limit=5)
                 if not top_companies.empty:
                     for i, (company, count) in enumerate(top_companies.items(), 1):
                         st.markdown(f"{i}. {company} ({count} tiket)")
@@ -238,20 +185,15 @@ if service_filter == "All":
 else:
     # Tampilan khusus jika service_filter dipilih, misalnya hanya "Issue"
     st.subheader(f"📌 Daftar Semua Tags untuk Service: {service_filter}")
-    st.markdown(f"**Total Tiket untuk Service `{service_filter}`:** {len(filtered_df)} tiket")
+    service_total = int(totals(dataset, "Services", start_date, end_date).get(service_filter, 0))
+    st.markdown(f"**Total Tiket untuk Service `{service_filter}`:** {service_total} tiket")
     # Pilihan Mode Analisis
     mode_filter = st.radio("Mode Tampilan:", ["📊 Semua Company", "🏢 Spesifik Company"], horizontal=True)
 
     # Jika pilih company spesifik, tampilkan pilihan company
     if mode_filter == "🏢 Spesifik Company":
-        company_list = (
-            filtered_df["Company"]
-            .dropna()
-            .value_counts()
-            .sort_values(ascending=False)
-            .index.tolist()
-        )
-          
+        company_list = ranked(dataset, "Company", start_date, end_date, service_scope)
+
         if "selected_specific_company" not in st.session_state:
             st.session_state.selected_specific_company = company_list[0] if company_list else None
 
@@ -264,29 +206,19 @@ else:
             index=company_list.index(st.session_state.selected_specific_company) if st.session_state.selected_specific_company in company_list else 0,
             key="selected_specific_company"
         )
-        tag_data = filtered_df[filtered_df["Company"] == selected_company]
         # Simpan state agar grafik dan tabel ikut menyesuaikan
-        filtered_df = filtered_df[filtered_df["Company"] == selected_company]
-
-    else:
-        tag_data = filtered_df.copy()
+        company_scope = selected_company
 
     tag_limit_option = st.selectbox(
     "Tampilkan jumlah tag:",
     options=["All Tags", "Top 5", "Top 10", "Top 20"])
 
-    if "Tags" in filtered_df.columns and filtered_df["Tags"].notna().sum() > 0:
-        tag_counts = tag_data["Tags"].value_counts()
+    tag_counts = top_n(dataset, "Tags", start_date, end_date, service_scope, company_scope,
+                       limit=TAG_LIMITS[tag_limit_option]) if "Tags" in df.columns else None
+    if tag_counts is not None and tag_counts.sum() > 0:
         if not tag_counts.empty:
             cols = st.columns(4)
-            if tag_limit_option == "Top 5":
-                tag_items = list(tag_counts.items())[:5]
-            elif tag_limit_option == "Top 10":
-                tag_items = list(tag_counts.items())[:10]
-            elif tag_limit_option == "Top 20":
-                tag_items = list(tag_counts.items())[:20]
-            else:
-                tag_items = list(tag_counts.items())
+            tag_items = list(tag_counts.items())
 
             st.session_state.current_tag_items = tag_items
 
@@ -310,6 +242,29 @@ else:
         st.session_state.current_tag_items = []
         st.info(f"Tidak ditemukan kolom Tags atau seluruh nilainya kosong untuk service **{service_filter}**.")
 
+# opsi tanpa teks cari dibatasi yang terbanyak dulu; sisanya dicari lewat inverted index
+OPSI_MAKS = 50
+
+def pilih_nilai(by, label, default_options, key, max_selections=None):
+    # kotak cari + multiselect Tags/Company untuk filter detail & grafik perbandingan
+    cari = st.text_input(f"🔎 Cari {label}", key=f"{key}_cari").strip()
+    if cari:
+        options = search_options(dataset, by, cari, start_date, end_date, service_scope, company_scope)
+    else:
+        options = default_options[:OPSI_MAKS]
+
+    default = options[:1]
+    if key in st.session_state:
+        # pilihan yang tidak ada di filter sekarang dibuang; kalau habis, kembali ke opsi pertama
+        ada = set(ranked(dataset, by, start_date, end_date, service_scope, company_scope))
+        st.session_state[key] = [v for v in st.session_state[key] if v in ada] or default_options[:1]
+        default = None
+    # pilihan sebelumnya tetap ada di opsi walau tidak cocok dengan teks cari
+    terpilih = [v for v in st.session_state.get(key, []) if v not in options]
+    return st.multiselect(f"Pilih {label}:", options=terpilih + options, default=default, key=key,
+                          max_selections=max_selections)
+
+profiling.mark("detail")
 st.markdown("---")
 if service_filter !="All":
     st.subheader(f"🧾 Tabel Detail Tiket untuk Service: {service_filter}")
@@ -319,7 +274,8 @@ if service_filter !="All":
         "Pilih jenis filter detail:",
         ["Tampilkan Semua", "Filter berdasarkan Tag", "Filter berdasarkan Company", "Filter berdasarkan Keduanya"])
 
-    detail_df = filtered_df.copy()
+    detail_tags = []
+    detail_companies = []
 
     if filter_mode == "Filter berdasarkan Tag":
         tag_items_from_session = st.session_state.get("current_tag_items", [])
@@ -329,124 +285,79 @@ if service_filter !="All":
 
         # Jika list kosong, fallback ke semua tags agar tidak error
         if not available_tags:
-            available_tags = (
-                filtered_df["Tags"]
-                .dropna()
-                .value_counts()
-                .sort_values(ascending=False)
-                .index.tolist()
-            )
+            available_tags = ranked(dataset, "Tags", start_date, end_date, service_scope, company_scope)
 
-        selected_tag = st.selectbox("Pilih Tag:", options=available_tags)
-        detail_df = detail_df[detail_df["Tags"] == selected_tag]
+        detail_tags = pilih_nilai("Tags", "Tag", available_tags, "detail_tags")
 
     elif filter_mode == "Filter berdasarkan Company":
-        available_companies = (
-            filtered_df["Company"]
-            .dropna()
-            .value_counts()
-            .sort_values(ascending=False)
-            .index.tolist()
-        )
+        available_companies = ranked(dataset, "Company", start_date, end_date, service_scope, company_scope)
 
-        selected_company = st.selectbox("Pilih Company:", options=available_companies)
-        detail_df = detail_df[detail_df["Company"] == selected_company]
+        detail_companies = pilih_nilai("Company", "Company", available_companies, "detail_companies")
 
     elif filter_mode == "Filter berdasarkan Keduanya":
-        available_tags = (
-            filtered_df["Tags"]
-            .dropna()
-            .value_counts()
-            .sort_values(ascending=False)
-            .index.tolist()
-        )
+        available_tags = ranked(dataset, "Tags", start_date, end_date, service_scope, company_scope)
+        available_companies = ranked(dataset, "Company", start_date, end_date, service_scope, company_scope)
 
-        available_companies = (
-            filtered_df["Company"]
-            .dropna()
-            .value_counts()
-            .sort_values(ascending=False)
-            .index.tolist()
-        )
+        detail_tags = pilih_nilai("Tags", "Tag", available_tags, "detail_tags")
+        detail_companies = pilih_nilai("Company", "Company", available_companies, "detail_companies")
 
-        selected_tag = st.selectbox("Pilih Tag:", options=available_tags)
-        selected_company = st.selectbox("Pilih Company:", options=available_companies)
+    needs_tag = filter_mode in ("Filter berdasarkan Tag", "Filter berdasarkan Keduanya")
+    needs_company = filter_mode in ("Filter berdasarkan Company", "Filter berdasarkan Keduanya")
 
-        detail_df = detail_df[
-            (detail_df["Tags"] == selected_tag) &
-            (detail_df["Company"] == selected_company)]
+    # tabel per halaman: cuma baris & kolom yang kelihatan yang dikirim ke browser
+    col_search, col_size = st.columns([3, 1])
+    search_text = col_search.text_input("🔎 Cari di tabel detail", "").strip()
+    page_size = col_size.selectbox("Baris per halaman", options=[25, 50, 100, 250], index=1)
+    detail_columns = st.multiselect("Kolom yang ditampilkan", options=list(df.columns), default=list(df.columns))
 
-    if detail_df.empty:
+    if (needs_tag and not detail_tags) or (needs_company and not detail_companies):
+        # belum ada tag/company yang dipilih
+        detail_pos = np.array([], dtype=np.int64)
+    else:
+        detail_pos = detail_positions(dataset, start_date, end_date, service_scope, company_scope,
+                                      tuple(detail_tags), tuple(detail_companies), search_text)
+
+    if len(detail_pos) == 0:
         st.info(f"Tidak ada data detail tiket untuk service **{service_filter}** pada periode yang dipilih.")
     else:
-        st.dataframe(detail_df.sort_values(by="Tags", ascending=True))
+        n_pages = math.ceil(len(detail_pos) / page_size)
+        page = st.number_input("Halaman", min_value=1, max_value=n_pages, value=1, step=1)
+        page_df = detail_page(dataset, detail_pos, page - 1, page_size, detail_columns)
+        with timed("render.table", rows=len(page_df), bytes=payload_bytes(page_df)):
+            st.dataframe(page_df)
+        st.caption(f"{len(detail_pos)} tiket · halaman {page} dari {n_pages}")
 
 # ===============================
 # 📈 Tampilan Grafik Interaktif (untuk semua pilihan Services)
 # ===============================
+profiling.mark("grafik")
 st.markdown("---")
 st.subheader("📈 Grafik Analisis Berdasarkan Pilihan")
 
-tab_grafik = st.tabs(["📊 Grafik Berdasarkan Tags", "🏢 Grafik Berdasarkan Company"])
-
-# Gunakan grafik_df sebagai basis, copy dari filtered_df
-grafik_df = filtered_df.copy()
-
-with tab_grafik[0]:
-    all_tags = (
-    grafik_df["Tags"]
-    .dropna()
-    .value_counts()
-    .sort_values(ascending=False)
-    .index.tolist()
-    )
-
-
-    if "selected_tag" not in st.session_state:
-        st.session_state.selected_tag = all_tags[0] if all_tags else None
-
-    if st.session_state.selected_tag not in all_tags:
-        st.session_state.selected_tag = all_tags[0] if all_tags else None
-
-    selected_tag = st.selectbox(
-        "Pilih Tag...",
-        options=all_tags,
-        index=all_tags.index(st.session_state.selected_tag) if st.session_state.selected_tag in all_tags else 0,
-        key="selected_tag"
-    )
-
-    bulan_opsi = {
-        1: "Januari", 2: "Februari", 3: "Maret", 4: "April", 5: "Mei", 6: "Juni",
-        7: "Juli", 8: "Agustus", 9: "September", 10: "Oktober", 11: "November", 12: "Desember"
-    }
-
-    bulan_order = list(bulan_opsi.values())
-
-    df_tag = grafik_df[grafik_df["Tags"] == selected_tag].copy()
+if filter_type == "Per Hari":
+    _, resolusi = chart_resolution(start_date, end_date)
+    if resolusi != "hari":
+        st.caption(f"ℹ️ Rentang tanggal panjang, grafik ditampilkan per {resolusi}.")
 
-    if filter_type == "Per Hari":
-        df_tag["Tanggal"] = df_tag["Created Date"]
-        x_type = "temporal"
-        x_sort = None
-    elif filter_type == "Per Bulan":
-        df_tag["Tanggal"] = df_tag["Created Date"].dt.day
-        x_type = "ordinal"
-        x_sort = None
-    else:  # Per Tahun
-        df_tag["Tanggal"] = df_tag["Created Date"].dt.month
-        df_tag["Tanggal"] = df_tag["Tanggal"].map(lambda x: bulan_opsi.get(x, str(x)))
-        x_type = "nominal"
-        x_sort = bulan_order
-
-    tag_summary = df_tag.groupby("Tanggal").size().reset_index(name="Jumlah Tiket")
-
-    if tag_summary.empty:
-        st.info("Tidak ada data untuk tag ini pada periode yang dipilih.")
-    else:
-        chart = alt.Chart(tag_summary).mark_line(point=True).encode(
+# sumbu X dipakai bareng semua grafik: tanggal (Per Hari), nomor tanggal (Per Bulan), nama bulan (Per Tahun)
+if filter_type == "Per Hari":
+    x_type = "temporal"
+    x_sort = None
+elif filter_type == "Per Bulan":
+    x_type = "ordinal"
+    x_sort = None
+else:  # Per Tahun
+    x_type = "nominal"
+    x_sort = list(BULAN.values())
+
+def grafik_deret(series, by):
+    # satu nilai: garis + label angka; beberapa nilai: satu garis per nilai, dibedakan warna
+    if series[by].nunique() == 1:
+        data = series.drop(columns=by)
+        chart = alt.Chart(data).mark_line(point=True).encode(
             x=alt.X("Tanggal", type=x_type, sort=x_sort),
-            y=alt.Y("Jumlah Tiket:Q", scale=alt.Scale(domainMin=tag_summary["Jumlah Tiket"].min() * 0.9))
-        ) + alt.Chart(tag_summary).mark_text(
+            y=alt.Y("Jumlah Tiket:Q", scale=alt.Scale(domainMin=data["Jumlah Tiket"].min() * 0.9))
+        ) + alt.Chart(data).mark_text(
             align="center",
             baseline="bottom",
             dy=-5
@@ -455,82 +366,109 @@ with tab_grafik[0]:
             y="Jumlah Tiket:Q",
             text="Jumlah Tiket:Q"
         )
+    else:
+        data = series
+        chart = alt.Chart(data).mark_line(point=True).encode(
+            x=alt.X("Tanggal", type=x_type, sort=x_sort),
+            y="Jumlah Tiket:Q",
+            color=alt.Color(f"{by}:N", sort=list(data[by].unique())),
+            tooltip=["Tanggal", by, "Jumlah Tiket"]
+        )
+    # serialisasi Altair (to_dict) terjadi di dalam st.altair_chart
+    with timed("render.chart", rows=len(data), bytes=payload_bytes(data)):
         st.altair_chart(chart, use_container_width=True)
 
-all_companies = (
-    grafik_df["Company"]
-    .dropna()
-    .value_counts()
-    .sort_values(ascending=False)
-    .index.tolist()
-)
+tab_grafik = st.tabs(["📊 Grafik Berdasarkan Tags", "🏢 Grafik Berdasarkan Company"])
 
-if "selected_company" not in st.session_state:
-    st.session_state.selected_company = all_companies[0] if all_companies else None
+# beberapa tag/company bisa dibandingkan sekaligus (maks MAX_SERIES garis),
+# semua deretnya dihitung dalam satu groupby
+with tab_grafik[0]:
+    all_tags = ranked(dataset, "Tags", start_date, end_date, service_scope, company_scope)
+    selected_tags = pilih_nilai("Tags", "Tag", all_tags, "grafik_tags", max_selections=MAX_SERIES)
 
-if st.session_state.selected_company not in all_companies:
-    st.session_state.selected_company = all_companies[0] if all_companies else None
+    tag_summary = compare_series(dataset, filter_type, start_date, end_date, "Tags", tuple(selected_tags),
+                                 service_scope, company_scope)
+
+    if not selected_tags:
+        st.info("Pilih minimal satu tag.")
+    elif tag_summary.empty:
+        st.info("Tidak ada data untuk tag ini pada periode yang dipilih.")
+    else:
+        grafik_deret(tag_summary, "Tags")
 
 with tab_grafik[1]:
-    all_companies = (
-    grafik_df["Company"]
-    .dropna()
-    .value_counts()
-    .sort_values(ascending=False)
-    .index.tolist()
-)
+    all_companies = ranked(dataset, "Company", start_date, end_date, service_scope, company_scope)
+    selected_companies = pilih_nilai("Company", "Company", all_companies, "grafik_companies",
+                                     max_selections=MAX_SERIES)
 
-    if "selected_company" not in st.session_state:
-        st.session_state.selected_company = all_companies[0] if all_companies else None
+    company_summary = compare_series(dataset, filter_type, start_date, end_date, "Company",
+                                     tuple(selected_companies), service_scope)
 
-    if st.session_state.selected_company not in all_companies:
-        st.session_state.selected_company = all_companies[0] if all_companies else None
+    if not selected_companies:
+        st.info("Pilih minimal satu company.")
+    elif company_summary.empty:
+        st.info("Tidak ada data untuk company ini pada periode yang dipilih.")
+    else:
+        grafik_deret(company_summary, "Company")
 
-    selected_company = st.selectbox(
-        "Pilih Company:",
-        options=all_companies,
-        index=all_companies.index(st.session_state.selected_company) if st.session_state.selected_company in all_companies else 0,
-        key="selected_company"
+# ===============================
+# ⏱️ Lama Penyelesaian & Backlog
+# ===============================
+profiling.mark("penyelesaian")
+st.markdown("---")
+st.subheader("⏱️ Lama Penyelesaian Tiket")
+st.caption("Tiket yang dibuat pada periode yang dipilih; lama penyelesaian = Finish Date - Created Date.")
+
+def format_durasi(jam):
+    if math.isnan(jam):
+        return "-"
+    return f"{jam:.1f} jam" if jam < 48 else f"{jam / 24:.1f} hari"
+
+stats = resolution_stats(dataset, start_date, end_date, service_scope, company_scope)
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Tiket Selesai", f"{stats['selesai']} / {stats['tiket']}")
+col2.metric("Belum Selesai", stats["tiket"] - stats["selesai"])
+col3.metric("Median", format_durasi(stats["median"]))
+col4.metric("P90", format_durasi(stats["p90"]))
+
+# jumlah tiket terbuka di akhir tiap titik (semua tiket, termasuk yang dibuat sebelum periode)
+backlog = backlog_series(dataset, filter_type, start_date, end_date, service_scope, company_scope)
+if not backlog.empty:
+    st.markdown("**📉 Backlog (tiket terbuka)**")
+    chart = alt.Chart(backlog).mark_line(point=True).encode(
+        x=alt.X("Tanggal", type=x_type, sort=x_sort),
+        y=alt.Y("Tiket Terbuka:Q"),
+        tooltip=["Tanggal", "Tiket Terbuka"]
     )
+    with timed("render.chart", rows=len(backlog), bytes=payload_bytes(backlog)):
+        st.altair_chart(chart, use_container_width=True)
 
-    bulan_opsi = {
-        1: "Januari", 2: "Februari", 3: "Maret", 4: "April", 5: "Mei", 6: "Juni",
-        7: "Juli", 8: "Agustus", 9: "September", 10: "Oktober", 11: "November", 12: "Desember"
-    }
-
-    bulan_order = list(bulan_opsi.values())
+group_options = [c for c in ["Services", "Tags", "Company"] if c in df.columns]
+if stats["selesai"] > 0 and group_options:
+    group_by = st.selectbox("Lama penyelesaian per:", options=group_options)
+    resolution_table = resolution_by(dataset, group_by, start_date, end_date, service_scope, company_scope)
+    with timed("render.table", rows=len(resolution_table), bytes=payload_bytes(resolution_table)):
+        st.dataframe(resolution_table.round(1), hide_index=True)
 
-    df_company = grafik_df[grafik_df["Company"] == selected_company].copy()
+rerun = profiling.finish_rerun()
 
-    if filter_type == "Per Hari":
-        df_company["Tanggal"] = df_company["Created Date"]
-        x_type = "temporal"
-        x_sort = None
-    elif filter_type == "Per Bulan":
-        df_company["Tanggal"] = df_company["Created Date"].dt.day
-        x_type = "ordinal"
-        x_sort = None
-    else:  # Per Tahun
-        df_company["Tanggal"] = df_company["Created Date"].dt.month
-        df_company["Tanggal"] = df_company["Tanggal"].map(lambda x: bulan_opsi.get(x, str(x)))
-        x_type = "nominal"
-        x_sort = bulan_order
-
-    company_summary = df_company.groupby("Tanggal").size().reset_index(name="Jumlah Tiket")
-
-    if company_summary.empty:
-        st.info("Tidak ada data untuk company ini pada periode yang dipilih.")
-    else:
-        chart = alt.Chart(company_summary).mark_line(point=True).encode(
-            x=alt.X("Tanggal", type=x_type, sort=x_sort),
-            y=alt.Y("Jumlah Tiket:Q", scale=alt.Scale(domainMin=company_summary["Jumlah Tiket"].min() * 0.9))
-        ) + alt.Chart(company_summary).mark_text(
-            align="center",
-            baseline="bottom",
-            dy=-5
-        ).encode(
-            x=alt.X("Tanggal", type=x_type, sort=x_sort),
-            y="Jumlah Tiket:Q",
-            text="Jumlah Tiket:Q"
-        )
-        st.altair_chart(chart, use_container_width=True)
+# ===============================
+# ⏱️ Panel profiling (admin)
+# ===============================
+# tampil kalau ADMIN_KEY diset di secrets dan URL memakai ?admin=<ADMIN_KEY>
+ADMIN_KEY = st.secrets.get("ADMIN_KEY")
+if ADMIN_KEY and st.query_params.get("admin") == ADMIN_KEY:
+    with st.sidebar:
+        st.markdown("---")
+        st.header("⏱️ Profiling")
+        st.caption(f"Rerun ini: {rerun.total_ms():.0f} ms · data versi {dataset.version}")
+        st.dataframe(rerun.frame(), hide_index=True)
+
+        st.markdown("**Persentil per tahap**")
+        st.dataframe(profiler.percentiles().round(2), hide_index=True)
+
+        st.markdown("**Cache view**")
+        st.dataframe(pd.DataFrame.from_dict(cache_stats(), orient="index"))
+
+        st.download_button("⬇️ Unduh log (JSONL)", profiler.export_jsonl(),
+                           file_name="profiling.jsonl", mime="application/json")
@@ -0,0 +1,172 @@
+# Latency tiap interaksi dashboard lewat query.py (tanpa Streamlit), di data
+# tiket sintetis berbagai ukuran. "dingin" = cache view kosong (pilihan filter
+# baru), "hangat" = pilihan yang sama diminta lagi (rerun / session lain).
+#
+#   python benchmarks/bench_dashboard.py [jumlah_baris ...] [--json hasil.jsonl]
+#
+# Contoh: python benchmarks/bench_dashboard.py 10000 100000 1000000 5000000
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import Dataset  # noqa: E402
+from query import (  # noqa: E402
+    MAX_SERIES, TAG_LIMITS, backlog_series, chart_series, clear_caches, compare_series, date_window,
+    detail_page, detail_positions, ranked, resolution_by, resolution_stats, search_options,
+    service_options, top_n, totals,
+)
+from synthetic import SERVICES, make_frame  # noqa: E402
+
+REPEAT = 5
+
+YEAR = date_window("Per Tahun", year=2022, months=list(range(1, 13)))
+MONTH = date_window("Per Bulan", year=2022, month=6)
+ALL_DAYS = date_window("Per Hari", (datetime.date(2020, 1, 1), datetime.date(2024, 12, 31)))
+
+
+def ringkasan_all(ds):
+    # halaman awal: Services = All, Per Tahun
+    start, end = YEAR
+    service_options(ds)
+    totals(ds, "Services", start, end)
+    for service in SERVICES:
+        top_n(ds, "Tags", start, end, service, limit=5)
+        top_n(ds, "Company", start, end, service, limit=5)
+    tag = ranked(ds, "Tags", start, end)[0]
+    company = ranked(ds, "Company", start, end)[0]
+    chart_series(ds, "Per Tahun", start, end, tag=tag)
+    chart_series(ds, "Per Tahun", start, end, company=company)
+
+
+def pilih_service(ds):
+    # Services = Issue, Top 20 tag, tabel detail halaman pertama
+    start, end = YEAR
+    totals(ds, "Services", start, end)
+    top_n(ds, "Tags", start, end, "Issue", limit=TAG_LIMITS["Top 20"])
+    ranked(ds, "Company", start, end, "Issue")
+    positions = detail_positions(ds, start, end, "Issue", None)
+    detail_page(ds, positions, 0, 50)
+
+
+def spesifik_company(ds):
+    start, end = YEAR
+    company = ranked(ds, "Company", start, end, "Issue")[0]
+    top_n(ds, "Tags", start, end, "Issue", company)
+    positions = detail_positions(ds, start, end, "Issue", company)
+    detail_page(ds, positions, 0, 50)
+
+
+def filter_detail_tag(ds):
+    start, end = YEAR
+    tag = ranked(ds, "Tags", start, end, "Issue")[0]
+    positions = detail_positions(ds, start, end, "Issue", None, (tag,))
+    detail_page(ds, positions, 0, 50)
+
+
+def cari_detail(ds):
+    start, end = YEAR
+    positions = detail_positions(ds, start, end, "Issue", None, search="company 12")
+    detail_page(ds, positions, 0, 50)
+
+
+def pilih_beberapa_company(ds):
+    # cari company (dengan typo) lalu filter detail ke 3 hasil teratas
+    start, end = YEAR
+    names = search_options(ds, "Company", "compny 12", start, end, "Issue")
+    positions = detail_positions(ds, start, end, "Issue", None, detail_companies=tuple(names[:3]))
+    detail_page(ds, positions, 0, 50)
+
+
+def grafik_per_bulan(ds):
+    start, end = MONTH
+    tag = ranked(ds, "Tags", start, end, "Issue")[0]
+    chart_series(ds, "Per Bulan", start, end, "Issue", tag=tag)
+
+
+def grafik_per_hari_5_tahun(ds):
+    start, end = ALL_DAYS
+    tag = ranked(ds, "Tags", start, end)[0]
+    chart_series(ds, "Per Hari", start, end, tag=tag)
+
+
+def bandingkan_20_tag_5_tahun(ds):
+    # grafik perbandingan MAX_SERIES tag teratas, satu groupby untuk semua garis
+    start, end = ALL_DAYS
+    tags = ranked(ds, "Tags", start, end)[:MAX_SERIES]
+    compare_series(ds, "Per Hari", start, end, "Tags", tuple(tags))
+
+
+def penyelesaian_5_tahun(ds):
+    # median/p90 + backlog harian 5 tahun untuk satu service
+    start, end = ALL_DAYS
+    resolution_stats(ds, start, end, "Issue")
+    resolution_by(ds, "Company", start, end, "Issue")
+    backlog_series(ds, "Per Hari", start, end, "Issue")
+
+
+INTERACTIONS = [
+    ringkasan_all,
+    pilih_service,
+    spesifik_company,
+    filter_detail_tag,
+    cari_detail,
+    pilih_beberapa_company,
+    grafik_per_bulan,
+    grafik_per_hari_5_tahun,
+    bandingkan_20_tag_5_tahun,
+    penyelesaian_5_tahun,
+]
+
+
+def measure(fn, ds):
+    cold, warm = [], []
+    for _ in range(REPEAT):
+        clear_caches()
+        t0 = time.perf_counter()
+        fn(ds)
+        t1 = time.perf_counter()
+        fn(ds)
+        t2 = time.perf_counter()
+        cold.append((t1 - t0) * 1000)
+        warm.append((t2 - t1) * 1000)
+    return statistics.median(cold), statistics.median(warm)
+
+
+def main(sizes, json_path=None):
+    records = []
+    for n_rows in sizes:
+        df = make_frame(n_rows)
+        t0 = time.perf_counter()
+        ds = Dataset(df, version=1)
+        build_ms = (time.perf_counter() - t0) * 1000
+        del df
+
+        print(f"\n{n_rows} tiket sintetis (bangun Dataset: {build_ms:.0f} ms)")
+        print(f"{'interaksi':28} {'dingin (ms)':>12} {'hangat (ms)':>12}")
+        records.append({"rows": n_rows, "interaction": "build_dataset", "cold_ms": build_ms, "warm_ms": None})
+        for fn in INTERACTIONS:
+            cold, warm = measure(fn, ds)
+            print(f"{fn.__name__:28} {cold:>12.2f} {warm:>12.3f}")
+            records.append({"rows": n_rows, "interaction": fn.__name__, "cold_ms": cold, "warm_ms": warm})
+
+    if json_path:
+        # satu baris per pengukuran, ditambahkan ke file supaya bisa dibandingkan antar commit
+        stamp = datetime.datetime.now().isoformat(timespec="seconds")
+        with open(json_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps({"timestamp": stamp, **record}) + "\n")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    json_path = None
+    if "--json" in args:
+        i = args.index("--json")
+        json_path = args[i + 1]
+        del args[i:i + 2]
+    main([int(a) for a in args] or [10_000, 100_000, 1_000_000], json_path)
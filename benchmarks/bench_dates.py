@@ -0,0 +1,66 @@
+# Bandingkan parse tanggal lama (pd.to_datetime tanpa format) dengan
+# dates.parse_dates di beberapa bentuk export sheet.
+#
+#   python benchmarks/bench_dates.py [jumlah_baris]
+import datetime
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dates import parse_dates  # noqa: E402
+
+# (nama, [(format strftime, bobot)])
+SCENARIOS = [
+    ("export (dd/mm/yyyy hh:mm:ss)", [("%d/%m/%Y %H:%M:%S", 1.0)]),
+    ("tanggal saja (dd/mm/yyyy)", [("%d/%m/%Y", 1.0)]),
+    ("campuran", [
+        ("%d/%m/%Y %H:%M:%S", 0.7),
+        ("%Y-%m-%d %H:%M", 0.2),
+        ("%d-%m-%Y", 0.08),
+        ("%-d/%-m/%Y %-H:%M", 0.02),
+    ]),
+]
+
+
+def make_dates(n_rows: int, formats, seed: int = 0) -> pd.Series:
+    rnd = random.Random(seed)
+    base = datetime.datetime(2020, 1, 1)
+    names = [fmt for fmt, _ in formats]
+    weights = [w for _, w in formats]
+    out = []
+    for _ in range(n_rows):
+        if rnd.random() < 0.05:
+            out.append(None)
+            continue
+        value = base + datetime.timedelta(minutes=rnd.randrange(60 * 24 * 365 * 5))
+        out.append(value.strftime(rnd.choices(names, weights)[0]))
+    return pd.Series(out, dtype=object)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - t0) * 1000, result
+
+
+def main(n_rows):
+    print(f"{n_rows} baris per skenario")
+    print(f"{'':32} {'lama (ms)':>10} {'NaT':>8} {'mixed (ms)':>11} {'NaT':>8} {'baru (ms)':>10} {'NaT':>8}")
+    for name, formats in SCENARIOS:
+        s = make_dates(n_rows, formats)
+        t_old, old = timed(lambda: pd.to_datetime(s, errors="coerce", dayfirst=True))
+        t_mixed, mixed = timed(lambda: pd.to_datetime(s, errors="coerce", dayfirst=True, format="mixed"))
+        t_new, (new, _) = timed(lambda: parse_dates(s))
+        print(
+            f"{name:32} {t_old:>10.0f} {int(old.isna().sum()):>8} "
+            f"{t_mixed:>11.0f} {int(mixed.isna().sum()):>8} {t_new:>10.0f} {int(new.isna().sum()):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,48 @@
+# Bandingkan normalisasi baris lama (loop per baris) dengan normalize_rows().
+#
+#   python benchmarks/bench_normalize.py [jumlah_baris ...]
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loader import normalize_rows  # noqa: E402
+from synthetic import make_values  # noqa: E402
+
+
+def legacy_normalize(header, rows):
+    # versi load_data() sebelumnya
+    max_len = len(header)
+    fixed_rows = []
+    for r in rows:
+        r = r[:max_len] + [""] * max(0, max_len - len(r))
+        fixed_rows.append(r)
+    df = pd.DataFrame(fixed_rows, columns=header)
+    return df.replace({"": None}).dropna(how="all")
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for n in sizes:
+        values = make_values(n)
+        header, rows = values[0], values[1:]
+        repeat = 3 if n <= 100_000 else 1
+        t_old = best_of(lambda: legacy_normalize(header, rows), repeat)
+        t_new = best_of(lambda: normalize_rows(header, rows), repeat)
+        print(f"{n:>10} {t_old:>12.3f} {t_new:>15.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,73 @@
+# Laporan memori & latency sebelum/sesudah SCHEMA (category + datetime64)
+# di data tiket sintetis.
+#
+#   python benchmarks/bench_schema.py [jumlah_baris]
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loader import normalize_rows, rows_to_frame  # noqa: E402
+from synthetic import make_values  # noqa: E402
+
+
+def legacy_frame(header, rows):
+    # tipe kolom seperti load_data() sebelumnya: semua object, tanggal di-parse
+    df = normalize_rows(header, rows)
+    for col in ["Created Date", "Finish Date"]:
+        df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
+    return df
+
+
+def count_values(series: pd.Series) -> pd.Series:
+    # value_counts() di kolom category ikut menampilkan kategori dengan 0 tiket
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def interactions(df):
+    tag = df["Tags"].mode()[0]
+    company = df["Company"].mode()[0]
+    issue = df[df["Services"] == "Issue"]
+    return {
+        "Services == 'Issue'": lambda: df[df["Services"] == "Issue"],
+        "Tags == tag": lambda: df[df["Tags"] == tag],
+        "Company == company": lambda: df[df["Company"] == company],
+        "Tags value_counts (Issue)": lambda: count_values(issue["Tags"]),
+        "Company list (Issue)": lambda: issue["Company"].dropna().pipe(count_values).index.tolist(),
+    }
+
+
+def main(n_rows):
+    values = make_values(n_rows)
+    header, rows = values[0], values[1:]
+    before = legacy_frame(header, rows)
+    after = rows_to_frame(header, rows)
+    del values, rows
+
+    print(f"{n_rows} tiket sintetis")
+    print(f"{'':30} {'sebelum':>12} {'sesudah':>12}")
+    mb_before = before.memory_usage(deep=True).sum() / 2**20
+    mb_after = after.memory_usage(deep=True).sum() / 2**20
+    print(f"{'memori (MB)':30} {mb_before:>12.1f} {mb_after:>12.1f}")
+
+    ops_before = interactions(before)
+    ops_after = interactions(after)
+    for name in ops_before:
+        print(f"{name + ' (ms)':30} {best_of(ops_before[name]):>12.2f} {best_of(ops_after[name]):>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,68 @@
+# Generator data tiket sintetis dengan bentuk seperti respons Sheets API
+# (list of list string, sel kosong di ujung baris dipotong).
+import datetime
+import random
+
+HEADER = ["No", "Created Date", "Services", "Tags", "Company", "Finish Date", "Keterangan"]
+SERVICES = ["Issue", "Request", "Question", "Task"]
+
+
+def make_values(n_rows: int, seed: int = 0, n_tags: int = 200, n_companies: int = 2000):
+    rnd = random.Random(seed)
+    tags = [f"Tag {i}" for i in range(n_tags)]
+    companies = [f"PT Company {i}" for i in range(n_companies)]
+    base = datetime.datetime(2020, 1, 1)
+    span_minutes = 60 * 24 * 365 * 5
+
+    values = [list(HEADER)]
+    for i in range(n_rows):
+        created = base + datetime.timedelta(minutes=rnd.randrange(span_minutes))
+        finish = ""
+        if rnd.random() < 0.8:
+            finish = (created + datetime.timedelta(hours=rnd.randrange(1, 400))).strftime("%d/%m/%Y %H:%M:%S")
+        row = [
+            str(i + 1),
+            created.strftime("%d/%m/%Y %H:%M:%S"),
+            rnd.choice(SERVICES),
+            rnd.choice(tags) if rnd.random() < 0.95 else "",
+            rnd.choice(companies),
+            finish,
+            "" if rnd.random() < 0.7 else "catatan",
+        ]
+        while row and row[-1] == "":
+            row.pop()
+        if rnd.random() < 0.001:
+            row = []
+        values.append(row)
+    return values
+
+
+def make_frame(n_rows: int, seed: int = 0, n_tags: int = 200, n_companies: int = 2000):
+    # DataFrame bertipe langsung (seperti hasil loader.rows_to_frame), dibuat dengan
+    # numpy supaya jutaan baris tetap cepat. Buat benchmark query, bukan parsing.
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    base = np.datetime64("2020-01-01T00:00", "m")
+    created = base + rng.integers(0, 60 * 24 * 365 * 5, n_rows).astype("timedelta64[m]")
+    finish = created + rng.integers(1, 400, n_rows).astype("timedelta64[h]")
+    finish[rng.random(n_rows) >= 0.8] = np.datetime64("NaT")
+
+    def categorical(names, p_empty=0.0):
+        codes = rng.integers(0, len(names), n_rows)
+        codes[rng.random(n_rows) < p_empty] = -1
+        categories = pd.Index(names).sort_values()
+        # kode di atas menunjuk ke `names`, petakan ke urutan kategori yang sudah di-sort
+        remap = categories.get_indexer(names)
+        return pd.Categorical.from_codes(np.where(codes >= 0, remap[codes], -1), categories=categories)
+
+    return pd.DataFrame({
+        "No": pd.Series(np.arange(1, n_rows + 1).astype(str), dtype=object),
+        "Created Date": created.astype("datetime64[ns]"),
+        "Services": categorical(SERVICES),
+        "Tags": categorical([f"Tag {i}" for i in range(n_tags)], p_empty=0.05),
+        "Company": categorical([f"PT Company {i}" for i in range(n_companies)]),
+        "Finish Date": finish.astype("datetime64[ns]"),
+        "Keterangan": pd.Series(np.where(rng.random(n_rows) < 0.7, None, "catatan"), dtype=object),
+    })
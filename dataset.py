@@ -0,0 +1,323 @@
+import difflib
+
+import numpy as np
+import pandas as pd
+
+
+def day_window(first_day, last_day):
+    # [hari pertama 00:00, hari setelah hari terakhir 00:00)
+    return pd.Timestamp(first_day), pd.Timestamp(last_day) + pd.Timedelta(days=1)
+
+
+def month_window(year: int, first_month: int, last_month: int = None):
+    # [tanggal 1 bulan pertama, tanggal 1 setelah bulan terakhir)
+    start = pd.Timestamp(year=int(year), month=int(first_month), day=1)
+    end = pd.Timestamp(year=int(year), month=int(last_month or first_month), day=1) + pd.offsets.MonthBegin(1)
+    return start, end
+
+
+NS_PER_DAY = 86_400 * 10**9
+
+# nama bulan untuk label sumbu X, urut Januari..Desember
+BULAN = {
+    1: "Januari", 2: "Februari", 3: "Maret", 4: "April", 5: "Mei", 6: "Juni",
+    7: "Juli", 8: "Agustus", 9: "September", 10: "Oktober", 11: "November", 12: "Desember"
+}
+
+# jenis bucket waktu: D/W/M/Y = hari/minggu/bulan/tahun kalender,
+# "tgl" = tanggal dalam bulan (1-31), "bulan" = bulan dalam tahun (1-12)
+BUCKETS = ["D", "W", "M", "Y", "tgl", "bulan"]
+
+
+def bucket_codes(days: np.ndarray) -> dict:
+    # days: epoch ns tanggal 00:00 -> kode integer tiap jenis bucket. Tanggal
+    # yang sama banyak berulang, jadi kalendernya dihitung per tanggal unik saja
+    unique, inverse = np.unique(days, return_inverse=True)
+    day = unique // NS_PER_DAY
+    index = pd.DatetimeIndex(unique.view("datetime64[ns]"))
+    year = index.year.to_numpy(dtype=np.int32)
+    month = index.month.to_numpy(dtype=np.int32)
+    codes = {
+        "D": day.astype(np.int32),
+        # minggu mulai Senin; 1970-01-01 hari Kamis
+        "W": ((day + 3) // 7).astype(np.int32),
+        "M": year * 12 + month - 1,
+        "Y": year,
+        "tgl": index.day.to_numpy(dtype=np.int8),
+        "bulan": month.astype(np.int8),
+    }
+    return {kind: values[inverse] for kind, values in codes.items()}
+
+
+def bucket_labels(kind: str, codes) -> pd.Index:
+    # kode bucket -> label sumbu X (awal periode, nomor tanggal, atau nama bulan)
+    codes = np.asarray(codes, dtype=np.int64)
+    if kind == "tgl":
+        return pd.Index(codes)
+    if kind == "bulan":
+        names = pd.Categorical.from_codes(codes - 1, categories=list(BULAN.values()), ordered=True)
+        return pd.CategoricalIndex(names)
+    if kind == "M":
+        days = (codes // 12 - 1970) * 12 + codes % 12
+        return pd.DatetimeIndex(days.astype("datetime64[M]").astype("datetime64[ns]"))
+    if kind == "Y":
+        return pd.DatetimeIndex((codes - 1970).astype("datetime64[Y]").astype("datetime64[ns]"))
+    days = codes * 7 - 3 if kind == "W" else codes
+    return pd.DatetimeIndex(days.astype("datetime64[D]").astype("datetime64[ns]"))
+
+
+class DateIndex:
+    """Indeks posisi untuk kolom tanggal yang sudah terurut (NaT di paling belakang).
+
+    Rentang tanggal jadi slice posisi lewat binary search, tanpa boolean mask
+    dan tanpa copy.
+    """
+
+    def __init__(self, dates: pd.Series):
+        n_valid = int(dates.notna().sum())
+        self._keys = dates.to_numpy(dtype="datetime64[ns]")[:n_valid].view("i8")
+
+        # pasangan (tahun, bulan) yang ada di data, buat pilihan di sidebar
+        valid = dates.iloc[:n_valid]
+        year_month = np.unique(valid.dt.year.to_numpy() * 12 + valid.dt.month.to_numpy() - 1)
+        self.months_by_year = {}
+        for ym in year_month.tolist():
+            self.months_by_year.setdefault(ym // 12, []).append(ym % 12 + 1)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def min(self) -> pd.Timestamp:
+        return pd.Timestamp(self._keys[0]) if len(self._keys) else pd.NaT
+
+    def max(self) -> pd.Timestamp:
+        return pd.Timestamp(self._keys[-1]) if len(self._keys) else pd.NaT
+
+    def years(self):
+        return sorted(self.months_by_year)
+
+    def days(self, positions) -> np.ndarray:
+        # epoch ns tanggal 00:00 baris di `positions` (posisi dari slice())
+        return self._keys[positions] // NS_PER_DAY * NS_PER_DAY
+
+    def slice(self, start, end) -> slice:
+        lo = int(np.searchsorted(self._keys, pd.Timestamp(start).value, side="left"))
+        hi = int(np.searchsorted(self._keys, pd.Timestamp(end).value, side="left"))
+        return slice(lo, max(lo, hi))
+
+
+class TicketCube:
+    """Jumlah tiket per (hari, Services, Tags, Company), dibangun sekali per versi data.
+
+    Ringkasan, Top-N dan deret waktu per tag/company dihitung dari sini (roll-up
+    jumlah per hari), bukan scan ulang baris tiket. Baris cube terurut per hari,
+    jadi rentang tanggal juga cukup binary search.
+    """
+
+    KEYS = ["Services", "Tags", "Company"]
+
+    def __init__(self, df: pd.DataFrame, dates: DateIndex):
+        keys = [c for c in self.KEYS if c in df.columns]
+        if len(dates) == 0:
+            self.df = pd.DataFrame({"day": pd.Series([], dtype="datetime64[ns]")})
+            for col in keys + ["count"]:
+                self.df[col] = pd.Series([], dtype=df[col].dtype if col in df.columns else "int64")
+        else:
+            # baris dengan Created Date kosong ada di paling belakang dan tidak ikut
+            valid = df.iloc[:len(dates)]
+            day = valid["Created Date"].dt.normalize().rename("day")
+            self.df = (
+                valid.groupby([day] + [valid[c] for c in keys], observed=True, dropna=False, sort=True)
+                .size()
+                .reset_index(name="count")
+            )
+        self._days = self.df["day"].to_numpy(dtype="datetime64[ns]").view("i8")
+        # kode bucket waktu per baris cube (kolom integer), jadi deret waktu di
+        # resolusi apa pun cukup satu groupby
+        for kind, codes in bucket_codes(self._days).items():
+            self.df[f"bucket_{kind}"] = codes
+
+    def window(self, start, end, **filters) -> pd.DataFrame:
+        lo = int(np.searchsorted(self._days, pd.Timestamp(start).value, side="left"))
+        hi = int(np.searchsorted(self._days, pd.Timestamp(end).value, side="left"))
+        cube = self.df.iloc[lo:max(lo, hi)]
+        # filters: nama kolom -> nilai (atau tuple nilai), contoh Services="Issue"
+        for col, value in filters.items():
+            if isinstance(value, tuple):
+                cube = cube[cube[col].isin(value)]
+            elif value is not None:
+                cube = cube[cube[col] == value]
+        return cube
+
+    def totals(self, by: str, start, end, **filters) -> pd.Series:
+        # jumlah tiket per nilai kolom `by`, terbesar dulu (seperti value_counts())
+        counts = self.window(start, end, **filters).groupby(by, observed=True)["count"].sum()
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+    def bucketed(self, kind: str, start, end, by: str = None, **filters) -> pd.Series:
+        # jumlah tiket per kode bucket (lihat BUCKETS), opsional dipecah per nilai kolom `by`
+        cube = self.window(start, end, **filters)
+        keys = [f"bucket_{kind}"] + ([by] if by else [])
+        return cube.groupby(keys, observed=True, sort=True)["count"].sum()
+
+
+class ResolutionIndex:
+    """Lama penyelesaian dan arus tiket masuk/selesai, dibangun sekali per versi data.
+
+    Lama penyelesaian (Finish Date - Created Date, dalam jam) disimpan sejajar
+    dengan baris frame, jadi persentil cukup diambil dari posisi hasil filter.
+    Waktu tiket dibuat dan selesai disimpan terurut, jadi jumlah kumulatif
+    sampai tanggal berapa pun cukup binary search. Backlog = dibuat - selesai
+    (kumulatif), tanpa menghitung ulang tiket terbuka di tiap hari.
+    """
+
+    def __init__(self, df: pd.DataFrame, dates: DateIndex, codes: dict):
+        # baris dengan Created Date kosong ada di paling belakang dan tidak ikut
+        valid = df.iloc[:len(dates)]
+        missing = pd.Series(pd.NaT, index=valid.index, dtype="datetime64[ns]")
+        created = valid.get("Created Date", missing)
+        finish = valid.get("Finish Date", missing)
+
+        # NaN = belum selesai. Finish Date sebelum Created Date dianggap salah input:
+        # tiketnya tetap selesai, saat dibuat (0 jam), sama dengan aturan backlog di bawah
+        hours = ((finish - created) / pd.Timedelta(hours=1)).to_numpy(dtype=float)
+        self.hours = np.full(len(df), np.nan)
+        self.hours[:len(valid)] = np.maximum(hours, 0)
+
+        # frame sudah urut Created Date -> waktu dibuat sudah terurut
+        self._opened = created.to_numpy(dtype="datetime64[ns]").view("i8")
+        self._opened_codes = {col: values[:len(valid)] for col, values in codes.items()}
+
+        # tiket yang Finish Date-nya salah dihitung selesai saat dibuatnya (lihat hours)
+        closed_at = finish.where(finish.isna() | (finish >= created), created)
+        closed = closed_at.to_numpy(dtype="datetime64[ns]").view("i8")
+        done = np.flatnonzero(closed_at.notna().to_numpy())
+        order = done[np.argsort(closed[done], kind="stable")]
+        self._closed = closed[order]
+        self._closed_codes = {col: values[order] for col, values in codes.items()}
+
+    def backlog(self, start, end, codes: dict = None) -> pd.Series:
+        # jumlah tiket terbuka di akhir tiap hari [start, end) (index = tanggal 00:00).
+        # codes: kolom -> kode kategori yang difilter (lihat Dataset.code_of)
+        opened, closed = self._opened, self._closed
+        if codes:
+            opened_mask = np.ones(len(opened), dtype=bool)
+            closed_mask = np.ones(len(closed), dtype=bool)
+            for col, code in codes.items():
+                opened_mask &= self._opened_codes[col] == code
+                closed_mask &= self._closed_codes[col] == code
+            opened, closed = opened[opened_mask], closed[closed_mask]
+
+        index = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end) - pd.Timedelta(days=1), freq="D")
+        day_end = (index + pd.Timedelta(days=1)).to_numpy(dtype="datetime64[ns]").view("i8")
+        n_open = np.searchsorted(opened, day_end, side="left") - np.searchsorted(closed, day_end, side="left")
+        return pd.Series(n_open, index=index)
+
+
+class PostingIndex:
+    """Inverted index satu kolom category: nilai -> posisi baris tempat nilai itu muncul.
+
+    Posting list semua nilai disimpan berurutan dalam satu array (format CSR:
+    `positions[offsets[kode]:offsets[kode + 1]]`). Frame sudah urut Created Date,
+    jadi tiap posting list juga urut tanggal dan baris satu nilai di rentang
+    tanggal tertentu cukup binary search di list-nya, tanpa scan frame.
+    """
+
+    # maksimal saran dari pencarian nama
+    SEARCH_LIMIT = 50
+
+    def __init__(self, series: pd.Series, codes: np.ndarray):
+        self.names = series.cat.categories
+        self._lower = self.names.astype(str).str.lower()
+        # kode -1 (kosong) di bucket pertama, tidak punya posting list
+        counts = np.bincount(codes + 1, minlength=len(self.names) + 1)
+        self.offsets = np.concatenate([[0], np.cumsum(counts[1:])])
+        self.positions = np.argsort(codes, kind="stable")[counts[0]:]
+
+    def rows(self, codes, window: slice = None) -> np.ndarray:
+        # posisi baris (urut) untuk satu atau beberapa kode, opsional dibatasi slice tanggal
+        parts = []
+        for code in codes:
+            if code < 0:
+                continue
+            posting = self.positions[self.offsets[code]:self.offsets[code + 1]]
+            if window is not None:
+                lo, hi = np.searchsorted(posting, [window.start, window.stop], side="left")
+                posting = posting[lo:hi]
+            parts.append(posting)
+        if not parts:
+            return np.array([], dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def search(self, text: str, limit: int = SEARCH_LIMIT, allowed: np.ndarray = None) -> list:
+        # nama yang cocok: awalan dulu, lalu yang mengandung teks, lalu yang mirip (typo).
+        # allowed: mask per kode, nama lain dilewati (contoh: yang tidak ada di rentang tanggal)
+        text = text.strip().lower()
+        if not text:
+            return []
+        if allowed is None:
+            allowed = np.ones(len(self.names), dtype=bool)
+        prefix = np.flatnonzero(np.asarray(self._lower.str.startswith(text), dtype=bool) & allowed)
+        contains = np.flatnonzero(np.asarray(self._lower.str.contains(text, regex=False), dtype=bool) & allowed)
+        found = list(dict.fromkeys(prefix.tolist() + contains.tolist()))
+        if len(found) < limit:
+            # nama bisa sama kalau huruf kecil semua ("PT ABC" / "pt abc"): satu nama mirip -> semua kodenya
+            by_lower = {}
+            candidates = np.flatnonzero(allowed)
+            for code, name in zip(candidates.tolist(), self._lower[candidates].tolist()):
+                by_lower.setdefault(name, []).append(code)
+            close = difflib.get_close_matches(text, list(by_lower), n=limit, cutoff=0.6)
+            found += [i for name in close for i in by_lower[name] if i not in found]
+        return self.names[found[:limit]].tolist()
+
+
+def category_rank(series: pd.Series) -> np.ndarray:
+    # urutan nama kategori tiap baris (kosong paling akhir), buat sort per nama
+    codes = series.cat.codes.to_numpy()
+    rank = series.cat.categories.argsort().argsort()
+    return np.where(codes >= 0, rank[codes], len(rank))
+
+
+class Dataset:
+    """Data tiket siap pakai untuk satu versi hasil load.
+
+    Frame diurutkan per Created Date sekali di sini, lalu dipakai bareng semua
+    session. Jangan diubah in-place.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: int):
+        if "Created Date" in df.columns:
+            df = df.sort_values("Created Date", kind="stable", na_position="last")
+            dates = df["Created Date"]
+        else:
+            dates = pd.Series([], dtype="datetime64[ns]")
+        self.df = df
+        self.version = version
+        self.dates = DateIndex(dates)
+        self.cube = TicketCube(df, self.dates)
+
+        # kode integer kolom category, buat filter posisi tanpa menyentuh frame
+        self._codes = {
+            col: df[col].cat.codes.to_numpy()
+            for col in df.columns
+            if isinstance(df[col].dtype, pd.CategoricalDtype)
+        }
+        self.resolution = ResolutionIndex(df, self.dates, {
+            col: codes for col, codes in self._codes.items() if col in TicketCube.KEYS
+        })
+        # urutan baris per Tags untuk tabel detail. Sort-nya stabil, jadi baris
+        # dengan tag yang sama tetap urut Created Date.
+        self.tag_rank = category_rank(df["Tags"]) if "Tags" in self._codes else np.zeros(len(df), dtype=np.int64)
+        self.tag_order = np.argsort(self.tag_rank, kind="stable")
+        # inverted index buat filter & pencarian Tags/Company
+        self.postings = {
+            col: PostingIndex(df[col], self._codes[col]) for col in ["Tags", "Company"] if col in self._codes
+        }
+
+    def codes(self, col: str) -> np.ndarray:
+        return self._codes[col]
+
+    def code_of(self, col: str, value) -> int:
+        # -2 = nilai tidak ada di data (tidak cocok dengan baris mana pun, termasuk yang kosong)
+        categories = self.df[col].cat.categories
+        return int(categories.get_loc(value)) if value in categories else -2
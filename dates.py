@@ -0,0 +1,169 @@
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# string yang oleh pandas dianggap tanggal kosong
+NAT_STRINGS = {"", "NaT", "nat", "NAT", "nan", "NaN", "NAN"}
+
+# lebih dari ini bentuk berbeda dengan panjang sama -> sisanya di-parse per nilai
+MAX_SHAPES = 32
+
+_YEAR_FIRST = re.compile(r"^\d{4}\D")
+_NAT = np.iinfo(np.int64).min
+
+# directive yang bisa di-parse langsung dari posisi angka -> nama komponen
+_FIXED_FIELDS = {"%Y": "year", "%m": "month", "%d": "day", "%H": "hour", "%M": "minute", "%S": "second"}
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+@functools.lru_cache(maxsize=256)
+def shape_format(shape: str):
+    # format strptime untuk satu bentuk string tanggal (semua angka jadi "1", contoh
+    # "7/03/2024 09:15" -> "1/11/1111 11:11"), None kalau tidak bisa ditebak.
+    # Format ditebak dari bentuknya, bukan dari nilai, jadi hasilnya sama untuk semua
+    # nilai berbentuk sama (tidak tergantung nilai mana yang kebetulan duluan).
+    # Tanggal di sheet ditulis hari dulu, kecuali yang diawali tahun (ISO: tahun-bulan-hari)
+    return guess_datetime_format(shape, dayfirst=not _YEAR_FIRST.match(shape))
+
+
+@functools.lru_cache(maxsize=256)
+def fixed_layout(shape: str, fmt: str):
+    # ((komponen, awal, akhir), ...) kalau tiap directive di fmt cocok dengan satu
+    # deret angka di shape (semua nilai berbentuk sama punya posisi angka yang sama);
+    # None kalau format tidak bisa di-parse per posisi
+    tokens = re.findall(r"%.|[^%]+", fmt)
+    runs = list(re.finditer(r"1+", shape))
+    directives = [t for t in tokens if t.startswith("%")]
+    if len(directives) != len(runs) or any(t not in _FIXED_FIELDS for t in directives):
+        return None
+    it = iter(runs)
+    if "".join(next(it).group() if t.startswith("%") else t for t in tokens) != shape:
+        return None
+    return tuple((_FIXED_FIELDS[t], run.start(), run.end()) for t, run in zip(directives, runs))
+
+
+def _fixed_to_ns(digits: np.ndarray, layout) -> np.ndarray:
+    # digits: matriks angka (n x panjang string). Hasil epoch ns, _NAT kalau tidak valid
+    n = len(digits)
+    fields = {}
+    for name, start, end in layout:
+        value = np.zeros(n, dtype=np.int64)
+        for i in range(start, end):
+            value = value * 10 + digits[:, i]
+        fields[name] = value
+    year = fields.get("year", np.full(n, 1970))
+    month = fields.get("month", np.ones(n, dtype=np.int64))
+    day = fields.get("day", np.ones(n, dtype=np.int64))
+    hour = fields.get("hour", 0)
+    minute = fields.get("minute", 0)
+    second = fields.get("second", 0)
+
+    month_ok = (month >= 1) & (month <= 12)
+    m = np.where(month_ok, month, 1)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    valid = (
+        month_ok
+        & (day >= 1) & (day <= _DAYS_IN_MONTH[m - 1] + (leap & (m == 2)))
+        & (hour < 24) & (minute < 60) & (second < 60)
+        # batas datetime64[ns]
+        & (year >= 1678) & (year <= 2261)
+    )
+
+    # jumlah hari sejak 1970-01-01 (algoritma days_from_civil)
+    y = year - (m <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((m + 9) % 12) + 2) // 5 + day - 1
+    days = era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+    ns = (((days * 24 + hour) * 60 + minute) * 60 + second) * 1_000_000_000
+    return np.where(valid, ns, _NAT)
+
+
+def _to_ns(parsed: pd.Series) -> np.ndarray:
+    # hasil pd.to_datetime bisa beresolusi detik; di luar batas datetime64[ns] jadi NaT.
+    # Nilai dengan zona waktu (mis. "...Z" atau "+07:00") disimpan sebagai waktu UTC tanpa zona
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_convert(None)
+    values = parsed.to_numpy()
+    in_range = (values >= np.datetime64(pd.Timestamp.min)) & (values <= np.datetime64(pd.Timestamp.max))
+    return np.where(in_range, values.astype("datetime64[ns]").view(np.int64), _NAT)
+
+
+def _parse_mixed(text: pd.Series) -> np.ndarray:
+    # parse per nilai (dateutil), buat bentuk yang formatnya tidak bisa ditebak
+    year_first = text.str.match(_YEAR_FIRST).to_numpy(dtype=bool)
+    out = np.full(len(text), _NAT, dtype=np.int64)
+    for flag in (False, True):
+        part = text[year_first == flag]
+        if len(part):
+            parsed = pd.to_datetime(part, format="mixed", dayfirst=not flag, errors="coerce", utc=True)
+            out[year_first == flag] = _to_ns(parsed)
+    return out
+
+
+def _parse_shape(shape: str, chars: np.ndarray, text: pd.Series) -> np.ndarray:
+    fmt = shape_format(shape)
+    layout = fixed_layout(shape, fmt) if fmt else None
+    if layout:
+        return _fixed_to_ns(chars.astype(np.int64) - 48, layout)
+    if fmt:
+        return _to_ns(pd.to_datetime(text, format=fmt, errors="coerce", utc=True))
+    return _parse_mixed(text)
+
+
+def _parse_unique(text: pd.Series) -> np.ndarray:
+    # text: string unik, tidak kosong. Dikelompokkan per panjang lalu per bentuk;
+    # bentuknya dihitung sekaligus dari matriks kode karakter, bukan per string
+    out = np.full(len(text), _NAT, dtype=np.int64)
+    lengths = text.str.len().to_numpy()
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        chars = np.array(text.iloc[rows].tolist(), dtype=f"<U{length}").view(np.uint32).reshape(len(rows), length)
+        shapes = np.where((chars >= 48) & (chars <= 57), 49, chars).astype(np.uint32)
+
+        remaining = np.arange(len(rows))
+        for _ in range(MAX_SHAPES):
+            if not len(remaining):
+                break
+            first = shapes[remaining[0]]
+            same = (shapes[remaining] == first).all(axis=1)
+            group = remaining[same]
+            remaining = remaining[~same]
+            shape = first.tobytes().decode("utf-32-le")
+            out[rows[group]] = _parse_shape(shape, chars[group], text.iloc[rows[group]])
+        if len(remaining):
+            out[rows[remaining]] = _parse_mixed(text.iloc[rows[remaining]])
+    return out
+
+
+def parse_dates(series: pd.Series):
+    """Kolom teks tanggal -> (Series datetime64[ns], mask nilai yang tidak terbaca).
+
+    String yang sama cukup di-parse sekali (banyak tiket di hari/jam yang sama).
+    Nilai dikelompokkan per bentuk; bentuk dengan angka di posisi tetap
+    (dd/mm/yyyy hh:mm:ss dan sejenisnya) di-parse langsung dari posisi angkanya,
+    bentuk lain dengan format eksplisit, dan yang gagal dicoba sekali lagi per nilai.
+    """
+    codes, uniques = pd.factorize(series)
+    parsed = np.full(len(uniques), _NAT, dtype=np.int64)
+
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    empty = text.isin(NAT_STRINGS).to_numpy()
+    filled = np.flatnonzero(~empty)
+    if len(filled):
+        parsed[filled] = _parse_unique(text.iloc[filled])
+
+    # contoh: tanggal 31/02 atau format campur di satu bentuk
+    failed = np.flatnonzero((parsed == _NAT) & ~empty)
+    if len(failed):
+        parsed[failed] = _parse_mixed(text.iloc[failed])
+
+    # kembalikan ke tiap baris lewat kode factorize (-1 = sel kosong)
+    bad = (parsed == _NAT) & ~empty
+    parsed = np.append(parsed, _NAT)
+    bad = np.append(bad, False)
+    result = parsed[codes].view("datetime64[ns]")
+    return pd.Series(result, index=series.index, name=series.name), bad[codes]
@@ -0,0 +1,232 @@
+"""Export laporan tiket tanpa membuka dashboard.
+
+Filter sama dengan sidebar dashboard (mode tanggal, Services, Company, Tags).
+Tiap laporan berisi baris tiket hasil filter, Top-N Tags/Company, total per
+Services dan deret waktu, ditulis sebagai CSV atau Parquet. Baris tiket ditulis
+per potongan, jadi tidak ada salinan penuh hasil filter di memori.
+
+    python export.py --mode "Per Bulan" --year 2024 --month 5 --service Issue
+    python export.py --mode "Per Tahun" --year 2024 --all-companies --workers 8 --format parquet
+"""
+import argparse
+import datetime
+import hashlib
+import os
+import re
+import sys
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dataset import Dataset
+from loader import DEFAULT_SNAPSHOT_PATH, SheetGroup, SheetSync
+from query import (
+    chart_series, date_window, detail_positions, position_series, position_totals, ranked, totals,
+)
+from sheets import build_sources
+
+# jumlah baris tiket yang dibentuk jadi DataFrame sekaligus saat menulis
+EXPORT_CHUNK_ROWS = 50_000
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+
+# Dataset per proses worker (diisi _init_worker)
+_dataset = None
+
+
+def load_config(path: str) -> dict:
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_dataset(config: dict, snapshot_path: str = None, refresh: bool = False) -> Dataset:
+    # pakai snapshot dashboard; sync ke Sheets kalau diminta atau snapshot belum ada
+    snapshot_path = snapshot_path or config.get("SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+    group = SheetGroup([SheetSync(source) for source in build_sources(config)])
+    if not group.restore_snapshot(snapshot_path) or refresh:
+        group.sync()
+        group.save_snapshot(snapshot_path)
+    return Dataset(group.df, group.version)
+
+
+def _write_chunks(chunks, path: str, fmt: str):
+    # chunks: iterator DataFrame dengan kolom sama; ditulis satu per satu
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, header=i == 0, index=False)
+        return
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                # kolom teks yang kosong semua di potongan pertama tetap bertipe string
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                for i, field in enumerate(schema):
+                    if pa.types.is_null(field.type):
+                        schema = schema.set(i, field.with_type(pa.string()))
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_rows(dataset: Dataset, positions, path: str, fmt: str, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    # baris tiket di `positions`, dibentuk per potongan dari frame dataset
+    df = dataset.df
+    if len(positions) == 0:
+        chunks = [df.iloc[:0]]
+    else:
+        chunks = (df.iloc[positions[i:i + chunk_rows]] for i in range(0, len(positions), chunk_rows))
+    _write_chunks(chunks, path, fmt)
+
+
+def write_frame(df: pd.DataFrame, path: str, fmt: str):
+    _write_chunks([df], path, fmt)
+
+
+def slug(text: str) -> str:
+    # "PT Maju/Jaya" -> "pt-maju-jaya-1a2b3c4d": nama yang dibuang tanda bacanya bisa sama
+    # ("PT A.B" / "PT A-B", atau beda huruf besar/kecil), jadi ditambah hash nama aslinya
+    digest = hashlib.sha1(str(text).encode("utf-8")).hexdigest()[:8]
+    name = re.sub(r"[^0-9A-Za-z]+", "-", str(text)).strip("-").lower()
+    return f"{name}-{digest}" if name else digest
+
+
+def export_report(dataset: Dataset, out_dir: str, filter_type: str, start, end, service=None, company=None,
+                  tags=(), search: str = "", fmt: str = "csv", top: int = 10) -> dict:
+    """Tulis satu laporan ke out_dir; hasilnya nama file -> jumlah baris."""
+    os.makedirs(out_dir, exist_ok=True)
+    ext = FORMATS[fmt]
+    tag = tuple(tags) or None
+    written = {}
+
+    positions = detail_positions(dataset, start, end, service, company, tuple(tags), (), search)
+    write_rows(dataset, positions, os.path.join(out_dir, f"tiket{ext}"), fmt)
+    written[f"tiket{ext}"] = len(positions)
+
+    # dengan --search, agregat dihitung dari baris hasil pencarian (teks tidak ada di cube),
+    # jadi semua file laporan memakai baris tiket yang sama
+    def counts(by):
+        if search:
+            return position_totals(dataset, by, positions)
+        return totals(dataset, by, start, end, service, company, tag)
+
+    if search:
+        series = position_series(dataset, filter_type, start, end, positions)
+    else:
+        series = chart_series(dataset, filter_type, start, end, service, company, tag)
+
+    aggregates = {
+        "services": counts("Services").rename_axis("Services").reset_index(name="Jumlah Tiket"),
+        "top_tags": counts("Tags").head(top).rename_axis("Tags").reset_index(name="Jumlah Tiket"),
+        "top_company": counts("Company").head(top).rename_axis("Company").reset_index(name="Jumlah Tiket"),
+        "deret_waktu": series,
+    }
+    for name, frame in aggregates.items():
+        write_frame(frame, os.path.join(out_dir, f"{name}{ext}"), fmt)
+        written[f"{name}{ext}"] = len(frame)
+    return written
+
+
+def _init_worker(config: dict, snapshot_path: str):
+    # dengan fork, Dataset dari proses utama sudah ada; dengan spawn, baca snapshot
+    global _dataset
+    if _dataset is None:
+        _dataset = load_dataset(config, snapshot_path)
+
+
+def _export_company(args):
+    company, out_dir, options = args
+    return company, export_report(_dataset, out_dir, company=company, **options)
+
+
+def parse_months(text: str) -> list:
+    # "1,2,3" -> [1, 2, 3]; bulan di luar 1-12 ditolak argparse, bukan jadi error pd.Timestamp
+    try:
+        months = [int(m) for m in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"daftar bulan tidak valid: {text!r}")
+    if any(not 1 <= m <= 12 for m in months):
+        raise argparse.ArgumentTypeError(f"bulan harus 1-12: {text!r}")
+    return months
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export laporan tiket (CSV/Parquet) tanpa membuka dashboard.")
+    parser.add_argument("--mode", choices=["Per Hari", "Per Bulan", "Per Tahun"], required=True)
+    parser.add_argument("--from", dest="date_from", type=datetime.date.fromisoformat, help="Per Hari: YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", type=datetime.date.fromisoformat, help="Per Hari: YYYY-MM-DD")
+    parser.add_argument("--year", type=int, help="Per Bulan / Per Tahun")
+    parser.add_argument("--month", type=int, choices=range(1, 13), metavar="1-12", help="Per Bulan")
+    parser.add_argument("--months", type=parse_months, default=list(range(1, 13)),
+                        help="Per Tahun: contoh 1,2,3 (default semua)")
+    parser.add_argument("--service", help="Services (default semua)")
+    parser.add_argument("--company", action="append", default=[],
+                        help="Satu laporan per company; boleh diulang")
+    parser.add_argument("--all-companies", action="store_true",
+                        help="Satu laporan per company yang punya tiket di periode & service ini")
+    parser.add_argument("--tag", action="append", default=[], help="Filter Tags; boleh diulang")
+    parser.add_argument("--search", default="",
+                        help="Teks yang dicari di semua kolom (seperti tabel detail); berlaku juga untuk agregat")
+    parser.add_argument("--top", type=int, default=10, help="Jumlah Top-N Tags/Company")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--out", default="laporan", help="Folder hasil")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml", help="Konfigurasi sumber data")
+    parser.add_argument("--snapshot", help="File snapshot (default SNAPSHOT_PATH di secrets)")
+    parser.add_argument("--refresh", action="store_true", help="Sync ke Google Sheets dulu")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Proses paralel untuk banyak company")
+    return parser.parse_args(argv)
+
+
+def _print_written(label: str, written: dict):
+    print(f"{label}: " + ", ".join(f"{name} ({n} baris)" for name, n in written.items()))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    complete = {
+        "Per Hari": args.date_from and args.date_to,
+        "Per Bulan": args.year and args.month,
+        "Per Tahun": args.year and args.months,
+    }[args.mode]
+    if not complete:
+        sys.exit("Periode belum lengkap: Per Hari butuh --from/--to, Per Bulan --year/--month, Per Tahun --year.")
+    start, end = date_window(args.mode, (args.date_from, args.date_to), args.year, args.month, args.months)
+
+    config = load_config(args.secrets)
+    global _dataset
+    _dataset = load_dataset(config, args.snapshot, args.refresh)
+
+    options = dict(filter_type=args.mode, start=start, end=end, service=args.service, tags=tuple(args.tag),
+                   search=args.search, fmt=args.format, top=args.top)
+    companies = args.company
+    if args.all_companies:
+        companies = ranked(_dataset, "Company", start, end, args.service)
+
+    if not companies:
+        _print_written(args.out, export_report(_dataset, args.out, **options))
+        return
+
+    jobs = [(company, os.path.join(args.out, slug(company)), options) for company in companies]
+    if args.workers <= 1 or len(jobs) == 1:
+        for company, written in map(_export_company, jobs):
+            _print_written(company, written)
+        return
+
+    # tiap worker pakai Dataset-nya sendiri; hasil dikirim balik cuma ringkasan jumlah baris
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(config, args.snapshot)) as pool:
+        chunksize = max(1, len(jobs) // (args.workers * 4))
+        for company, written in pool.map(_export_company, jobs, chunksize=chunksize):
+            _print_written(company, written)
+
+
+if __name__ == "__main__":
+    main()
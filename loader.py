@@ -0,0 +1,672 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dataset import Dataset
+from dates import parse_dates
+from profiling import timed
+
+log = logging.getLogger(__name__)
+
+# jumlah baris terakhir yang dicek ulang tiap sync (tiket baru biasanya masih diedit)
+TAIL_WINDOW = 500
+# sync incremental tidak melihat edit di atas jendela bawah (contoh Finish Date tiket
+# lama), jadi refresh background melakukan full load kalau full load terakhir lebih tua dari ini
+FULL_SYNC_INTERVAL = 24 * 60 * 60
+
+# full load dibaca per jendela baris, beberapa jendela sekaligus
+LOAD_CHUNK_ROWS = 10_000
+LOAD_WORKERS = 4
+# jumlah sumber (tab/spreadsheet) yang di-sync bersamaan
+SOURCE_WORKERS = 4
+# lokasi snapshot kalau SNAPSHOT_PATH tidak diset
+DEFAULT_SNAPSHOT_PATH = ".cache/tiket.arrow"
+
+# tipe kolom yang dipakai dashboard; kolom lain dibiarkan sebagai teks (object)
+SCHEMA = {
+    "Created Date": "datetime64[ns]",
+    "Finish Date": "datetime64[ns]",
+    "Services": "category",
+    "Tags": "category",
+    "Company": "category",
+}
+DATE_COLUMNS = [col for col, dtype in SCHEMA.items() if dtype.startswith("datetime64")]
+CATEGORY_COLUMNS = [col for col, dtype in SCHEMA.items() if dtype == "category"]
+
+# nama kolom SCHEMA, dicocokkan tanpa beda huruf besar/kecil
+_SCHEMA_NAMES = {col.casefold(): col for col in SCHEMA}
+
+# versi data (SheetSync/SheetGroup) diambil dari satu penghitung per proses, jadi selalu
+# naik walau holder dibuat ulang; cache query menganggap versi yang lebih kecil sudah basi
+_version_counter = itertools.count(1)
+
+# naikkan kalau bentuk DataFrame / isi metadata snapshot berubah
+SNAPSHOT_VERSION = 3
+
+
+class CategoryDictionary:
+    """Kamus kategori bersama untuk kolom category di SCHEMA.
+
+    Kategori baru selalu ditambahkan di belakang, jadi kode integer yang sudah
+    ada tidak pernah berubah. Potongan data yang di-encode dengan kamus yang
+    sama bisa di-concat tanpa di-encode ulang.
+    """
+
+    def __init__(self):
+        self.categories = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CategoryDictionary":
+        dictionary = cls()
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                dictionary.categories[col] = df[col].cat.categories
+        return dictionary
+
+    def update(self, col: str, values) -> pd.Index:
+        known = self.categories.get(col, pd.Index([], dtype=object))
+        new = pd.Index(pd.unique(values.dropna())).difference(known, sort=True)
+        if len(new):
+            known = known.append(new.astype(object))
+        self.categories[col] = known
+        return known
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                categories = self.update(col, df[col])
+                df[col] = pd.Categorical(df[col], categories=categories)
+        return df
+
+    def align(self, df: pd.DataFrame) -> pd.DataFrame:
+        # samakan kategori frame lama dengan kamus terbaru (kode lama tetap)
+        updates = {
+            col: df[col].cat.set_categories(self.categories[col])
+            for col in CATEGORY_COLUMNS
+            if col in df.columns and not df[col].cat.categories.equals(self.categories[col])
+        }
+        return df.assign(**updates) if updates else df
+
+    def sort(self):
+        # urutkan ulang kategori (hasilnya sama dengan encode sekali jalan).
+        # Hanya aman selama kode kategorinya belum dipakai di luar, yaitu saat full load
+        self.categories = {col: categories.sort_values() for col, categories in self.categories.items()}
+
+
+def apply_schema(df: pd.DataFrame, dictionary: CategoryDictionary, unparsed: dict = None) -> pd.DataFrame:
+    # parse tanggal kalau kolomnya ada; posisi baris yang tanggalnya tidak terbaca
+    # dicatat di `unparsed` (kolom -> Index)
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            with timed("load.parse_dates", column=col, rows=len(df)) as info:
+                parsed, bad = parse_dates(df[col])
+                info["unparsed"] = int(bad.sum())
+            df[col] = parsed.astype(SCHEMA[col])
+            if unparsed is not None and bad.any():
+                unparsed[col] = unparsed.get(col, pd.Index([], dtype="int64")).append(df.index[bad])
+
+    with timed("load.encode", rows=len(df)):
+        return dictionary.encode(df)
+
+
+def normalize_rows(header, rows, start: int = 0) -> pd.DataFrame:
+    # baris dari Sheets API panjangnya beda-beda (sel kosong di ujung dipotong).
+    # DataFrame(rows, dtype=object) mengubah list of list jadi satu array 2D dalam
+    # satu pass di C (yang kurang diisi None), tanpa bikin list baru per baris.
+    n_cols = len(header)
+    n_rows = len(rows)
+    index = pd.RangeIndex(start, start + n_rows)
+    if n_rows == 0:
+        return pd.DataFrame(index=index, columns=header, dtype=object)
+
+    raw = pd.DataFrame(rows, dtype=object).to_numpy()
+
+    # rapihin jumlah kolom biar sama dengan header
+    if raw.shape[1] >= n_cols:
+        raw = raw[:, :n_cols]
+    else:
+        raw = np.hstack([raw, np.full((n_rows, n_cols - raw.shape[1]), None, dtype=object)])
+
+    # empty string dianggap kosong (Sheets API sering ngasih empty string).
+    # semua sel berupa string/None, jadi bool(sel) == False artinya kosong
+    present = raw.astype(bool)
+    values = np.where(present, raw, None)
+
+    # buang baris kosong
+    non_empty = present.any(axis=1)
+    if not non_empty.all():
+        values = values[non_empty]
+        index = index[non_empty]
+
+    # index = posisi baris data di sheet (0 = baris setelah header)
+    return pd.DataFrame(values, index=index, columns=header, dtype=object)
+
+
+def rows_to_frame(header, rows, start: int = 0, dictionary: CategoryDictionary = None,
+                  unparsed: dict = None) -> pd.DataFrame:
+    with timed("load.normalize", rows=len(rows)):
+        df = normalize_rows(header, rows, start)
+    return apply_schema(df, dictionary if dictionary is not None else CategoryDictionary(), unparsed)
+
+
+def normalize_header(header) -> list:
+    # spasi berlebih dibuang, nama kolom SCHEMA ditulis seragam ("created  date" -> "Created Date")
+    out = []
+    for h in header:
+        h = " ".join(str(h).split())
+        out.append(_SCHEMA_NAMES.get(h.casefold(), h))
+    return out
+
+
+def combine_frames(frames: list) -> pd.DataFrame:
+    # gabungkan frame dari beberapa sumber: kolom dicocokkan tanpa beda huruf
+    # besar/kecil (urutan ikut sumber pertama), kolom yang tidak ada diisi kosong,
+    # dan kategori disatukan supaya hasilnya tetap category
+    if len(frames) == 1:
+        return frames[0]
+    if not frames:
+        return pd.DataFrame()
+
+    names = {}
+    renamed = []
+    for df in frames:
+        mapping = {col: names.setdefault(str(col).casefold(), col) for col in df.columns}
+        renamed.append(df.rename(columns=mapping))
+    columns = list(names.values())
+
+    categories = {}
+    for col in CATEGORY_COLUMNS:
+        if col in columns:
+            values = [df[col].cat.categories for df in renamed if col in df.columns]
+            categories[col] = values[0].append(values[1:]).unique().sort_values()
+
+    aligned = []
+    for df in renamed:
+        updates = {}
+        for col in columns:
+            if col in categories:
+                current = df[col] if col in df.columns else pd.Categorical([None] * len(df))
+                updates[col] = pd.Categorical(current, categories=categories[col])
+            elif col not in df.columns:
+                dtype = SCHEMA.get(col, object)
+                updates[col] = pd.Series(None, index=df.index, dtype=dtype)
+        aligned.append(df.assign(**updates)[columns])
+    return pd.concat(aligned, ignore_index=True)
+
+
+def _checksum(rows, n_cols: int) -> str:
+    # API memotong sel kosong di ujung baris, jadi samakan dulu bentuknya
+    normalized = []
+    for r in rows:
+        r = list(r[:n_cols])
+        while r and r[-1] == "":
+            r.pop()
+        normalized.append(r)
+    return hashlib.sha1(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+class SheetSync:
+    """Cache DataFrame satu tab sheet yang di-update secara incremental.
+
+    Yang disimpan: jumlah baris data terakhir dan checksum jendela baris paling
+    bawah. Sync berikutnya cukup membaca jendela itu + baris baru di bawahnya.
+    Kalau header berubah, jumlah baris berkurang, atau jendela bawah berubah
+    sekaligus ada baris baru (baris disisipkan / sheet diurutkan ulang), balik ke
+    full load. Edit di atas jendela bawah baru terbaca di full load berikutnya
+    (lihat FULL_SYNC_INTERVAL).
+    """
+
+    def __init__(self, source, tail_window: int = TAIL_WINDOW,
+                 chunk_rows: int = LOAD_CHUNK_ROWS, workers: int = LOAD_WORKERS):
+        self.source = source
+        self.tail_window = tail_window
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.loaded = False
+        self.header = None
+        self.n_rows = 0
+        self.tail_hash = None
+        self.df = pd.DataFrame()
+        self.dictionary = CategoryDictionary()
+        self.unparsed = {}
+        self.last_delta = 0
+        self.synced_at = 0.0
+        # waktu full load terakhir; 0 setelah restore snapshot (belum pernah full load di proses ini)
+        self.full_synced_at = 0.0
+        self.version = 0
+        self._saved_version = None
+        self._lock = threading.Lock()
+        self._pool = None
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # dipakai ulang antar refresh: thread yang sama -> service Sheets (per thread) dan
+        # koneksi HTTP-nya tetap hidup, tidak ada handshake TLS baru tiap full load
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sheet-window")
+        return self._pool
+
+    def _publish(self, df: pd.DataFrame):
+        self.df = df
+        self.version = next(_version_counter)
+
+    def _fetch_windows(self, n_grid_rows: int, n_cols: int):
+        # (posisi awal, baris) per jendela, urut dari atas. Paling banyak workers + 1
+        # jendela mentah yang tertahan di memori
+        pending = deque()
+        pool = self._executor()
+        try:
+            for start in range(0, n_grid_rows, self.chunk_rows):
+                pending.append((start, pool.submit(self._fetch_rows, start, start + self.chunk_rows, n_cols)))
+                if len(pending) > self.workers:
+                    first, future = pending.popleft()
+                    yield first, future.result()
+            while pending:
+                first, future = pending.popleft()
+                yield first, future.result()
+        finally:
+            # load gagal di tengah jalan: jendela yang belum mulai tidak perlu diambil
+            for _, future in pending:
+                future.cancel()
+
+    def _fetch_rows(self, start: int, end: int, n_cols: int):
+        with timed("sheets.fetch_rows", source=self.name) as info:
+            rows = self.source.fetch_rows(start, end, n_cols)
+            info["rows"] = len(rows)
+        return rows
+
+    def full_load(self) -> pd.DataFrame:
+        with timed("load.full_load", source=self.name) as info:
+            df = self._full_load()
+            info["rows"] = self.n_rows
+        return df
+
+    def _full_load(self) -> pd.DataFrame:
+        # dibaca per jendela LOAD_CHUNK_ROWS baris; tiap jendela langsung jadi frame
+        # bertipe, jadi list mentah dari API tidak pernah ada sekaligus untuk seluruh sheet.
+        # Semua dibangun di variabel lokal dan baru dipasang setelah jendela terakhir
+        # terbaca: kalau satu jendela gagal, state lama (atau belum-loaded) tetap utuh
+        with timed("sheets.fetch_layout", source=self.name):
+            header, n_grid_rows = self.source.fetch_layout()
+
+        dictionary = CategoryDictionary()
+        unparsed = {}
+        if not header:
+            header, n_rows, tail_hash = None, 0, None
+            df = pd.DataFrame()
+        else:
+            header = normalize_header(header)
+            n_cols = len(header)
+            chunks = []
+            tail = []  # baris mentah paling bawah, buat checksum
+            n_rows = 0
+            for start, rows in self._fetch_windows(n_grid_rows, n_cols):
+                if not rows:
+                    continue
+                # baris kosong di antara jendela dikembalikan API sebagai []
+                tail = (tail + [[]] * min(start - n_rows, self.tail_window) + rows)[-self.tail_window:]
+                n_rows = start + len(rows)
+                chunks.append(rows_to_frame(header, rows, start, dictionary, unparsed))
+
+            # urutan kategori disamakan dengan encode sekali jalan
+            dictionary.sort()
+            if chunks:
+                with timed("load.concat", chunks=len(chunks)):
+                    df = pd.concat([dictionary.align(chunk) for chunk in chunks])
+            else:
+                df = rows_to_frame(header, [], dictionary=dictionary)
+            tail_hash = _checksum(tail, n_cols)
+
+        self.header = header
+        self.dictionary = dictionary
+        self.unparsed = unparsed
+        self.n_rows = n_rows
+        self.tail_hash = tail_hash
+        self.last_delta = n_rows
+        self._publish(df)
+        self.loaded = True
+        self.synced_at = self.full_synced_at = time.time()
+        self._log_unparsed()
+        return self.df
+
+    def sync(self, full: bool = False) -> pd.DataFrame:
+        with self._lock:
+            return self._sync(full)
+
+    def _sync(self, full: bool) -> pd.DataFrame:
+        if full or self.header is None:
+            return self.full_load()
+
+        start = max(0, self.n_rows - self.tail_window)
+        with timed("sheets.fetch_tail", source=self.name) as info:
+            header, rows = self.source.fetch_tail(start, len(self.header))
+            info["rows"] = len(rows)
+        known = self.n_rows - start
+
+        if normalize_header(header) != self.header or len(rows) < known:
+            # struktur sheet berubah, delta tidak bisa dipercaya
+            return self.full_load()
+
+        if _checksum(rows[:known], len(self.header)) == self.tail_hash:
+            # cuma ada baris baru di bawah
+            offset, delta = self.n_rows, rows[known:]
+        elif len(rows) > known:
+            # jendela bawah berubah dan jumlah baris bertambah: bisa jadi baris disisipkan
+            # di tengah atau sheet diurutkan ulang, posisi baris di atas jendela ikut bergeser
+            return self.full_load()
+        else:
+            # ada baris di jendela bawah yang diedit -> ganti jendelanya sekalian
+            offset, delta = start, rows
+
+        if delta or offset < self.n_rows:
+            unparsed = {col: idx[idx < offset] for col, idx in self.unparsed.items()}
+            new_df = rows_to_frame(self.header, delta, offset, self.dictionary, unparsed)
+            kept = self.dictionary.align(self.df[self.df.index < offset])
+            self.unparsed = unparsed
+            if new_df.empty:
+                self._publish(kept)
+            elif kept.empty:
+                self._publish(new_df)
+            else:
+                # kategori kedua potongan sudah sama, concat tetap category
+                self._publish(pd.concat([kept, new_df]))
+
+        self.synced_at = time.time()
+        self.n_rows = start + len(rows)
+        self.tail_hash = _checksum(rows[-self.tail_window:], len(self.header))
+        self.last_delta = len(delta)
+        return self.df
+
+    def unparsed_counts(self) -> dict:
+        # jumlah nilai tanggal yang tidak terbaca per kolom
+        return {col: len(idx) for col, idx in self.unparsed.items() if len(idx)}
+
+    def _log_unparsed(self):
+        for col, n in self.unparsed_counts().items():
+            log.warning("%s: %d nilai %s tidak terbaca sebagai tanggal", self.name, n, col)
+
+    # ==================================
+    # 💾 Snapshot lokal (Arrow IPC, bisa di-memory-map)
+    # ==================================
+    def save_snapshot(self, path: str):
+        # tidak ditulis ulang kalau isinya sama dengan snapshot terakhir
+        if not self.loaded or self.header is None or self.version == self._saved_version:
+            return
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "source": self.source.name,
+            "header": self.header,
+            "n_rows": self.n_rows,
+            "tail_hash": self.tail_hash,
+            "tail_window": self.tail_window,
+            "unparsed": {col: idx.tolist() for col, idx in self.unparsed.items()},
+            "synced_at": self.synced_at,
+        }
+        with timed("snapshot.save", source=self.name, rows=len(self.df)):
+            self._write_snapshot(path, meta)
+
+    def _write_snapshot(self, path: str, meta: dict):
+        table = pa.Table.from_pandas(self.df, preserve_index=True)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), b"dashboard": json.dumps(meta).encode("utf-8")}
+        )
+
+        # tulis ke file sementara dulu supaya pembaca tidak pernah lihat file setengah jadi
+        # (nama unik per penulis: dashboard dan export.py bisa menulis snapshot yang sama bersamaan)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._saved_version = self.version
+
+    def restore_snapshot(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        try:
+            with timed("snapshot.restore", source=self.name), pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+                meta = json.loads(table.schema.metadata[b"dashboard"])
+                df = _table_to_frame(table)
+        except (pa.ArrowInvalid, OSError, KeyError, ValueError):
+            log.warning("Snapshot %s tidak bisa dibaca, diabaikan", path)
+            return False
+
+        if (
+            meta.get("version") != SNAPSHOT_VERSION
+            or meta.get("source") != self.source.name
+            or meta.get("tail_window") != self.tail_window
+        ):
+            return False
+
+        self.dictionary = CategoryDictionary.from_frame(df)
+        self._publish(df)
+        self.header = meta["header"]
+        self.n_rows = meta["n_rows"]
+        self.tail_hash = meta["tail_hash"]
+        self.unparsed = {col: pd.Index(rows, dtype="int64") for col, rows in meta.get("unparsed", {}).items()}
+        self.synced_at = meta["synced_at"]
+        self.last_delta = 0
+        self.loaded = True
+        self._saved_version = self.version
+        return True
+
+
+def _table_to_frame(table: pa.Table) -> pd.DataFrame:
+    # kolom teks Arrow jadi StringDtype di to_pandas; dikembalikan ke object (sel kosong None)
+    # supaya frame hasil snapshot sama persis dengan hasil rows_to_frame
+    df = table.to_pandas()
+    for name in df.columns:
+        kind = table.schema.field(name).type
+        if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+            df[name] = pd.Series(table.column(name).to_numpy(zero_copy_only=False), index=df.index, dtype=object)
+    return df
+
+
+def snapshot_path_for(path: str, name: str) -> str:
+    # .cache/tiket.arrow -> .cache/tiket-1a2b3c4d.arrow (satu file per sumber)
+    root, ext = os.path.splitext(path)
+    return f"{root}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}{ext}"
+
+
+class SheetGroup:
+    """Beberapa sumber (tab tahunan, spreadsheet lain) yang dipakai sebagai satu data.
+
+    Tiap sumber punya SheetSync, snapshot dan sync incremental sendiri, dan
+    di-sync bersamaan. Frame gabungan hanya dibangun ulang kalau ada sumber yang
+    berubah, jadi tab tahun lalu yang tidak disentuh cukup dicek checksum-nya.
+    """
+
+    def __init__(self, syncs: list, workers: int = SOURCE_WORKERS):
+        self.syncs = syncs
+        self.workers = workers
+        self.name = " + ".join(s.name for s in syncs)
+        self.df = pd.DataFrame()
+        self.version = 0
+        self.last_delta = 0
+        self._versions = None
+        self._lock = threading.Lock()
+        self._pool = None
+
+    @property
+    def loaded(self) -> bool:
+        return all(s.loaded for s in self.syncs)
+
+    @property
+    def synced_at(self) -> float:
+        return min(s.synced_at for s in self.syncs)
+
+    @property
+    def full_synced_at(self) -> float:
+        return min(s.full_synced_at for s in self.syncs)
+
+    def unparsed_counts(self) -> dict:
+        counts = {}
+        for s in self.syncs:
+            for col, n in s.unparsed_counts().items():
+                counts[col] = counts.get(col, 0) + n
+        return counts
+
+    def _combine(self):
+        versions = [s.version for s in self.syncs]
+        if versions == self._versions:
+            return
+        with timed("load.combine", sources=len(self.syncs)):
+            self.df = combine_frames([s.df for s in self.syncs if s.header])
+        self._versions = versions
+        self.version = next(_version_counter)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # dipakai ulang antar refresh, sama seperti SheetSync._executor (fetch_tail jalan di sini)
+        if self._pool is None:
+            workers = min(self.workers, max(1, len(self.syncs)))
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sheet-source")
+        return self._pool
+
+    def sync(self, full: bool = False) -> pd.DataFrame:
+        with self._lock:
+            list(self._executor().map(lambda s: s.sync(full=full), self.syncs))
+            self.last_delta = sum(s.last_delta for s in self.syncs)
+            self._combine()
+            return self.df
+
+    def _snapshot_path(self, path: str, sync: SheetSync) -> str:
+        # satu sumber tetap pakai path apa adanya
+        return path if len(self.syncs) == 1 else snapshot_path_for(path, sync.name)
+
+    def save_snapshot(self, path: str):
+        for s in self.syncs:
+            s.save_snapshot(self._snapshot_path(path, s))
+
+    def restore_snapshot(self, path: str) -> bool:
+        restored = [s.restore_snapshot(self._snapshot_path(path, s)) for s in self.syncs]
+        if any(s.loaded for s in self.syncs):
+            self._combine()
+        return all(restored)
+
+
+class _Flight:
+    def __init__(self, full: bool):
+        self.full = full
+        self.done = threading.Event()
+        self.error = None
+
+
+class DatasetHolder:
+    """Satu Dataset bersama untuk semua session di proses ini.
+
+    - get() tidak pernah menunggu, kecuali belum ada data sama sekali.
+    - refresh() single-flight: kalau sudah ada refresh yang jalan, pemanggil lain
+      menunggu hasil yang sama, bukan ikut memanggil Sheets API. Permintaan full
+      load yang ketemu refresh incremental menunggu, lalu menjalankan full load sendiri.
+    - Thread background me-refresh tiap `refresh_interval` detik sejak sync terakhir;
+      refresh itu jadi full load kalau full load terakhir lebih tua dari
+      `full_interval` (juga refresh pertama setelah restore snapshot).
+    Dataset baru dipasang dengan satu assignment, jadi pembaca selalu dapat versi
+    yang utuh (lama atau baru).
+    """
+
+    def __init__(self, sync, snapshot_path: str = None, refresh_interval: float = None,
+                 full_interval: float = FULL_SYNC_INTERVAL):
+        # sync: SheetSync atau SheetGroup
+        self.sync = sync
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self.full_interval = full_interval
+        self._lock = threading.Lock()
+        self._flight = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.dataset = Dataset(sync.df, sync.version)
+
+    def _publish(self):
+        # Dataset baru dibangun penuh dulu, baru dipasang (pembaca tidak lihat setengah jadi)
+        if self.dataset.version != self.sync.version:
+            with timed("dataset.build", rows=len(self.sync.df)):
+                self.dataset = Dataset(self.sync.df, self.sync.version)
+
+    def get(self) -> Dataset:
+        if not self.sync.loaded:
+            return self.refresh()
+        return self.dataset
+
+    def refresh(self, full: bool = False) -> Dataset:
+        while True:
+            with self._lock:
+                flight = self._flight
+                leader = flight is None
+                if leader:
+                    flight = self._flight = _Flight(full)
+            if leader:
+                break
+
+            flight.done.wait()
+            if full and not flight.full:
+                # refresh yang sedang jalan cuma incremental: tunggu selesai, lalu full load sendiri
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return self.dataset
+
+        try:
+            with timed("load.sync", full=full) as info:
+                self.sync.sync(full=full)
+                info["delta"] = self.sync.last_delta
+            self._publish()
+            if self.snapshot_path:
+                self.sync.save_snapshot(self.snapshot_path)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+        return self.dataset
+
+    def start(self):
+        # jalankan thread refresh terjadwal (sekali per proses)
+        if self._thread is not None or not self.refresh_interval:
+            return
+        self._thread = threading.Thread(target=self._run, name="dataset-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # tunggu sampai data (atau snapshot) sudah lebih tua dari refresh_interval
+            wait = self.sync.synced_at + self.refresh_interval - time.time()
+            if wait > 0:
+                if self._stop.wait(wait):
+                    return
+                continue
+            try:
+                self.refresh(full=time.time() - self.sync.full_synced_at > self.full_interval)
+            except Exception:
+                log.exception("Refresh background gagal untuk %s", self.sync.name)
+                # jangan langsung coba lagi kalau API sedang error
+                if self._stop.wait(min(self.refresh_interval, 60)):
+                    return
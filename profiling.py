@@ -0,0 +1,131 @@
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# log terstruktur: satu baris JSON per tahap (aktifkan level INFO untuk logger ini)
+log = logging.getLogger("dashboard.profiling")
+
+# jumlah pengukuran terakhir per tahap yang dipakai untuk persentil
+HISTORY = 500
+# jumlah event terakhir yang bisa diunduh dari panel admin
+RECENT_EVENTS = 2000
+
+_current = threading.local()
+
+
+class Profiler:
+    """Kumpulan waktu per tahap untuk seluruh proses (semua session + thread background)."""
+
+    def __init__(self, history: int = HISTORY, recent: int = RECENT_EVENTS):
+        self.history = history
+        self._durations = {}
+        self._events = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, ms: float, fields: dict):
+        event = {"ts": round(time.time(), 3), "stage": stage, "ms": round(ms, 3), **fields}
+        with self._lock:
+            self._durations.setdefault(stage, deque(maxlen=self.history)).append(ms)
+            self._events.append(event)
+        if log.isEnabledFor(logging.INFO):
+            log.info(json.dumps(event, default=str))
+
+    def percentiles(self) -> pd.DataFrame:
+        with self._lock:
+            durations = {stage: np.array(values) for stage, values in self._durations.items()}
+        rows = [
+            {
+                "tahap": stage,
+                "n": len(values),
+                "p50 (ms)": np.percentile(values, 50),
+                "p90 (ms)": np.percentile(values, 90),
+                "p99 (ms)": np.percentile(values, 99),
+                "max (ms)": values.max(),
+            }
+            for stage, values in sorted(durations.items())
+        ]
+        return pd.DataFrame(rows)
+
+    def events(self) -> list:
+        with self._lock:
+            return list(self._events)
+
+    def export_jsonl(self) -> str:
+        return "".join(json.dumps(event, default=str) + "\n" for event in self.events())
+
+
+profiler = Profiler()
+
+
+@contextlib.contextmanager
+def timed(stage: str, **fields):
+    # ukur satu tahap; isi dict yang di-yield (rows, bytes, cache, ...) ikut dicatat
+    info = dict(fields)
+    t0 = time.perf_counter()
+    try:
+        yield info
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        profiler.record(stage, ms, info)
+        rerun = getattr(_current, "rerun", None)
+        if rerun is not None:
+            rerun.events.append({"stage": stage, "ms": ms, **info})
+
+
+class Rerun:
+    """Catatan satu rerun script: bagian halaman (lewat mark) + tahap di dalamnya."""
+
+    def __init__(self):
+        self.events = []
+        self.started = time.perf_counter()
+        self._section = None
+        self._section_start = self.started
+
+    def mark(self, section: str = None):
+        # tutup bagian sebelumnya, mulai bagian baru (None = selesai)
+        now = time.perf_counter()
+        if self._section is not None:
+            ms = (now - self._section_start) * 1000
+            profiler.record(f"page.{self._section}", ms, {})
+            self.events.append({"stage": f"page.{self._section}", "ms": ms})
+        self._section = section
+        self._section_start = now
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.events)
+
+
+def start_rerun() -> Rerun:
+    # dipanggil di awal script; rerun sebelumnya yang berhenti di tengah (st.stop) dibuang
+    _current.rerun = Rerun()
+    return _current.rerun
+
+
+def mark(section: str = None):
+    rerun = getattr(_current, "rerun", None)
+    if rerun is not None:
+        rerun.mark(section)
+
+
+def finish_rerun():
+    rerun = getattr(_current, "rerun", None)
+    if rerun is None:
+        return None
+    rerun.mark(None)
+    _current.rerun = None
+    profiler.record("page.total", rerun.total_ms(), {"stages": len(rerun.events)})
+    return rerun
+
+
+def payload_bytes(df: pd.DataFrame) -> int:
+    # perkiraan ukuran data yang dikirim ke browser
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,337 @@
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from dataset import BULAN, PostingIndex, bucket_codes, bucket_labels, day_window, month_window  # noqa: F401
+from profiling import timed
+
+# batas titik per grafik (kira-kira 10px per titik di layout wide)
+MAX_CHART_POINTS = 120
+
+# batas jumlah garis di grafik perbandingan
+MAX_SERIES = 20
+
+# pilihan "Tampilkan jumlah tag" -> jumlah tag maksimal (None = semua)
+TAG_LIMITS = {"All Tags": None, "Top 5": 5, "Top 10": 10, "Top 20": 20}
+
+# resolusi sumbu X mode Per Hari, dari yang paling halus
+RESOLUSI = [("D", "hari"), ("W", "minggu"), ("M", "bulan"), ("Y", "tahun")]
+
+
+class LRUCache:
+    """Cache LRU berukuran tetap dengan penghitung hit/miss.
+
+    Entri untuk versi data lama dibuang begitu versi baru pertama kali diminta,
+    supaya Dataset lama tidak ikut tertahan di memori.
+    """
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, key, compute):
+        return self.lookup(version, key, compute)[0]
+
+    def lookup(self, version, key, compute):
+        # (nilai, True kalau dari cache). Versi data hanya naik: permintaan dengan versi
+        # lebih lama (session yang masih rerun saat versi baru dipasang) dihitung tanpa
+        # cache dan tidak mengosongkan entri versi baru
+        with self._lock:
+            if self._version is None or version >= self._version:
+                if version != self._version:
+                    self._data.clear()
+                    self._version = version
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return self._data[key], True
+            self.misses += 1
+
+        # hitung di luar lock; kalau dua session minta bersamaan paling dihitung dua kali
+        value = compute()
+        with self._lock:
+            if version == self._version:
+                self._data[key] = value
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value, False
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._version = None
+
+
+_caches = {}
+
+
+def memoize(maxsize: int = 32):
+    # key = (versi data, argumen lain setelah default diisi); argumen harus hashable
+    def decorator(fn):
+        cache = LRUCache(fn.__name__, maxsize)
+        _caches[fn.__name__] = cache
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(dataset, *args, **kwargs):
+            bound = signature.bind(dataset, *args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.values())[1:]
+            with timed(f"query.{fn.__name__}") as info:
+                value, hit = cache.lookup(dataset.version, key, lambda: fn(*bound.args, **bound.kwargs))
+                info["cache"] = "hit" if hit else "miss"
+                if hasattr(value, "__len__"):
+                    info["rows"] = len(value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> dict:
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_caches():
+    for cache in _caches.values():
+        cache.clear()
+
+
+# ==================================
+# 🎛️ Pilihan filter
+# ==================================
+
+def date_window(filter_type: str, date_range=None, year: int = None, month: int = None, months=None):
+    # rentang [start, end) untuk mode filter tanggal di sidebar; None kalau pilihannya belum lengkap
+    if filter_type == "Per Hari":
+        if isinstance(date_range, (tuple, list)) and len(date_range) == 2:
+            return day_window(date_range[0], date_range[1])
+        return None
+    if filter_type == "Per Bulan":
+        return month_window(year, month)
+    if not months:
+        return None
+    return month_window(year, min(months), max(months))
+
+
+@memoize(maxsize=1)
+def service_options(dataset) -> list:
+    return sorted(dataset.df["Services"].dropna().unique().tolist())
+
+
+# ==================================
+# 📊 View turunan per pilihan filter
+# ==================================
+# Hasilnya dipakai bareng semua session, jangan diubah in-place.
+
+@memoize(maxsize=128)
+def totals(dataset, by, start, end, service=None, company=None, tag=None) -> pd.Series:
+    return dataset.cube.totals(by, start, end, Services=service, Company=company, Tags=tag)
+
+
+def ranked(dataset, by, start, end, service=None, company=None, tag=None) -> list:
+    # nilai kolom `by` urut dari jumlah tiket terbanyak
+    return totals(dataset, by, start, end, service, company, tag).index.tolist()
+
+
+def top_n(dataset, by, start, end, service=None, company=None, tag=None, limit: int = None) -> pd.Series:
+    # `limit` nilai teratas (None = semua) beserta jumlah tiketnya
+    counts = totals(dataset, by, start, end, service, company, tag)
+    return counts if limit is None else counts.head(limit)
+
+
+def chart_resolution(start, end, max_points: int = MAX_CHART_POINTS):
+    # resolusi paling halus yang jumlah bucket-nya masih muat di grafik. Kode bucket
+    # hari/minggu/bulan/tahun berurutan, jadi jumlah bucket di [start, end) =
+    # kode hari terakhir - kode hari pertama + 1 (minggu/bulan terpotong ikut dihitung)
+    first = pd.Timestamp(start).normalize()
+    last = max(first, (pd.Timestamp(end) - pd.Timedelta(1)).normalize())
+    codes = bucket_codes(np.array([first.value, last.value], dtype=np.int64))
+    for freq, label in RESOLUSI:
+        if codes[freq][1] - codes[freq][0] + 1 <= max_points:
+            return freq, label
+    return RESOLUSI[-1]
+
+
+def _bucket_kind(filter_type, start, end, max_points: int = MAX_CHART_POINTS) -> str:
+    # bucket sumbu X: Per Hari ikut resolusi rentang (hari/minggu/bulan/tahun),
+    # Per Bulan per tanggal, Per Tahun per bulan
+    if filter_type == "Per Hari":
+        return chart_resolution(start, end, max_points)[0]
+    return "tgl" if filter_type == "Per Bulan" else "bulan"
+
+
+@memoize(maxsize=64)
+def chart_series(dataset, filter_type, start, end, service=None, company=None, tag=None,
+                 max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    # jumlah tiket per titik sumbu X: satu groupby di kode bucket cube (dihitung
+    # sekali per versi data), rentang panjang di Per Hari di-bucket per
+    # minggu/bulan/tahun supaya titiknya <= max_points
+    kind = _bucket_kind(filter_type, start, end, max_points)
+    counts = dataset.cube.bucketed(kind, start, end, Services=service, Company=company, Tags=tag)
+    return pd.DataFrame({"Tanggal": bucket_labels(kind, counts.index), "Jumlah Tiket": counts.to_numpy()})
+
+
+@memoize(maxsize=32)
+def compare_series(dataset, filter_type, start, end, by, values, service=None, company=None,
+                   max_points: int = MAX_CHART_POINTS, max_series: int = MAX_SERIES) -> pd.DataFrame:
+    # deret waktu beberapa nilai kolom `by` sekaligus (format panjang: Tanggal, by,
+    # Jumlah Tiket), dari satu groupby [bucket, by] di cube. Biayanya hampir sama
+    # dengan satu deret. values: tuple nama, dipotong ke max_series
+    values = tuple(values)[:max_series]
+    kind = _bucket_kind(filter_type, start, end, max_points)
+    filters = {"Services": service, "Company": company, by: values}
+    counts = dataset.cube.bucketed(kind, start, end, by=by, **filters)
+    # urutan garis = urutan pilihan; nilai tanpa tiket di filter ini tidak digambar
+    present = set(counts.index.get_level_values(by))
+    columns = pd.Index([value for value in values if value in present], dtype=object, name=by)
+    # bucket yang kosong untuk satu nilai diisi 0 supaya garisnya tidak melompat
+    table = counts.unstack(by, fill_value=0).reindex(columns=columns, fill_value=0)
+    long = table.stack().rename("Jumlah Tiket").reset_index()
+    long.insert(0, "Tanggal", bucket_labels(kind, long.pop(f"bucket_{kind}")))
+    return long
+
+
+@memoize(maxsize=32)
+def detail_positions(dataset, start, end, service, company, tags=(), detail_companies=(), search="") -> np.ndarray:
+    # posisi baris tabel detail, sudah urut per Tags (seperti dataset.tag_order),
+    # tanpa materialisasi frame. tags / detail_companies: tuple nama (kosong = semua);
+    # barisnya diambil langsung dari inverted index, tanpa scan seluruh rentang
+    window = dataset.dates.slice(start, end)
+    selected = None
+    for col, values in (("Tags", tags), ("Company", detail_companies)):
+        if values:
+            rows = dataset.postings[col].rows([dataset.code_of(col, value) for value in values], window)
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+
+    if selected is None:
+        positions = dataset.tag_order
+        positions = positions[(positions >= window.start) & (positions < window.stop)]
+    else:
+        positions = selected[np.argsort(dataset.tag_rank[selected], kind="stable")]
+
+    positions = _filter_positions(dataset, positions, (("Services", service), ("Company", company)))
+
+    if search:
+        positions = positions[_search_mask(dataset, positions, search)]
+    return positions
+
+
+@memoize(maxsize=64)
+def search_options(dataset, by, text, start, end, service=None, company=None,
+                   limit: int = PostingIndex.SEARCH_LIMIT) -> list:
+    # nama di kolom `by` yang cocok dengan teks (awalan/mengandung/mirip) dan punya
+    # tiket di filter ini, urut kecocokan
+    index = dataset.postings[by]
+    present = totals(dataset, by, start, end, service, company).index
+    allowed = np.zeros(len(index.names), dtype=bool)
+    allowed[index.names.get_indexer(present)] = True
+    return index.search(text, limit, allowed)
+
+
+def _filter_positions(dataset, positions, filters) -> np.ndarray:
+    # filters: pasangan (kolom, nilai); nilai None = tidak difilter
+    for col, value in filters:
+        if value is not None:
+            positions = positions[dataset.codes(col)[positions] == dataset.code_of(col, value)]
+    return positions
+
+
+def _search_mask(dataset, positions, text: str) -> np.ndarray:
+    # cari teks (tanpa beda huruf besar/kecil) di semua kolom teks baris terpilih
+    df = dataset.df
+    text = text.lower()
+    mask = np.zeros(len(positions), dtype=bool)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            # cukup cek nama kategorinya, lalu cocokkan kode
+            categories = df[col].cat.categories.astype(str)
+            matched = np.flatnonzero(categories.str.lower().str.contains(text, regex=False))
+            mask |= np.isin(dataset.codes(col)[positions], matched)
+        elif pd.api.types.is_object_dtype(df[col].dtype) or pd.api.types.is_string_dtype(df[col].dtype):
+            values = df[col].iloc[positions].fillna("").astype(str).str.lower()
+            mask |= values.str.contains(text, regex=False).to_numpy(dtype=bool)
+    return mask
+
+
+def position_totals(dataset, by, positions) -> pd.Series:
+    # seperti totals(), tapi dihitung dari posisi baris (contoh: hasil pencarian teks)
+    categories = dataset.df[by].cat.categories
+    codes = dataset.codes(by)[positions]
+    counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(categories)),
+                       index=pd.CategoricalIndex(categories, categories=categories, name=by), name="count")
+    return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+
+def position_series(dataset, filter_type, start, end, positions, max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    # seperti chart_series(), tapi dihitung dari posisi baris
+    kind = _bucket_kind(filter_type, start, end, max_points)
+    counts = pd.Series(bucket_codes(dataset.dates.days(positions))[kind]).value_counts().sort_index()
+    return pd.DataFrame({"Tanggal": bucket_labels(kind, counts.index), "Jumlah Tiket": counts.to_numpy()})
+
+
+def detail_page(dataset, positions, page: int, page_size: int, columns=None) -> pd.DataFrame:
+    # hanya baris & kolom halaman ini yang dibentuk jadi DataFrame
+    page_df = dataset.df.iloc[positions[page * page_size:(page + 1) * page_size]]
+    return page_df if columns is None else page_df[list(columns)]
+
+
+# ==================================
+# ⏱️ Lama penyelesaian & backlog
+# ==================================
+
+def _resolution_positions(dataset, start, end, service, company, tag) -> np.ndarray:
+    # posisi tiket yang dibuat di [start, end) dan cocok dengan filter
+    window = dataset.dates.slice(start, end)
+    positions = np.arange(window.start, window.stop)
+    return _filter_positions(dataset, positions, (("Services", service), ("Company", company), ("Tags", tag)))
+
+
+@memoize(maxsize=32)
+def resolution_stats(dataset, start, end, service=None, company=None, tag=None) -> dict:
+    # tiket yang dibuat di rentang ini: jumlah, yang sudah selesai, median & p90 lama selesai (jam)
+    hours = dataset.resolution.hours[_resolution_positions(dataset, start, end, service, company, tag)]
+    done = hours[~np.isnan(hours)]
+    median, p90 = np.percentile(done, [50, 90]) if len(done) else (np.nan, np.nan)
+    return {"tiket": len(hours), "selesai": len(done), "median": float(median), "p90": float(p90)}
+
+
+@memoize(maxsize=32)
+def resolution_by(dataset, by, start, end, service=None, company=None, tag=None) -> pd.DataFrame:
+    # median & p90 lama selesai (jam) per nilai kolom `by`, yang paling lama dulu
+    positions = _resolution_positions(dataset, start, end, service, company, tag)
+    hours = dataset.resolution.hours[positions]
+    done = ~np.isnan(hours)
+    groups = pd.Series(hours[done]).groupby(dataset.df[by].iloc[positions[done]].to_numpy(), observed=True)
+    table = pd.DataFrame({
+        "Selesai": groups.size(),
+        "Median (jam)": groups.median(),
+        "P90 (jam)": groups.quantile(0.9),
+    })
+    return table.rename_axis(by).sort_values("Median (jam)", ascending=False, kind="stable").reset_index()
+
+
+@memoize(maxsize=64)
+def backlog_series(dataset, filter_type, start, end, service=None, company=None, tag=None,
+                   max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    # jumlah tiket terbuka di akhir tiap titik sumbu X (sama dengan chart_series)
+    filters = {"Services": service, "Company": company, "Tags": tag}
+    codes = {col: dataset.code_of(col, value) for col, value in filters.items() if value is not None}
+    daily = dataset.resolution.backlog(start, end, codes)
+    kind = _bucket_kind(filter_type, start, end, max_points)
+    last = daily.groupby(bucket_codes(daily.index.to_numpy(dtype="datetime64[ns]").view("i8"))[kind]).last()
+    return pd.DataFrame({"Tanggal": bucket_labels(kind, last.index), "Tiket Terbuka": last.to_numpy()})
@@ -0,0 +1,192 @@
+import csv
+import threading
+
+from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+
+# percobaan ulang per request untuk 429 (kuota baca) dan 5xx, dengan backoff eksponensial
+# bawaan googleapiclient; satu jendela yang gagal sesaat tidak membatalkan full load
+API_RETRIES = 5
+
+# field mask: cukup nilai sel, tanpa metadata lain
+VALUE_FIELDS = "valueRanges(valueRange(values))"
+# jumlah baris grid dan isi sel baris header
+LAYOUT_FIELDS = "sheets(properties(gridProperties(rowCount)),data(rowData(values(formattedValue))))"
+
+
+class SheetsClient:
+    """Client Sheets API yang dipakai ulang selama proses hidup.
+
+    Credentials (dan access token-nya) dibuat sekali. Objek service dibuat per
+    thread karena transport httplib2 tidak thread-safe. Untuk test offline, isi
+    `http` dengan googleapiclient.http.HttpMock / HttpMockSequence.
+    """
+
+    def __init__(self, credentials=None, http=None):
+        self.credentials = credentials
+        self.http = http
+        self._local = threading.local()
+
+    @classmethod
+    def from_service_account_info(cls, service_account_info):
+        return cls(Credentials.from_service_account_info(service_account_info, scopes=SCOPES))
+
+    def service(self):
+        service = getattr(self._local, "service", None)
+        if service is None:
+            if self.http is not None:
+                service = build("sheets", "v4", http=self.http, cache_discovery=False, static_discovery=True)
+            else:
+                service = build("sheets", "v4", credentials=self.credentials, cache_discovery=False)
+            self._local.service = service
+        return service
+
+    def values_by_filter(self, spreadsheet_id: str, data_filters: list) -> list:
+        # satu request untuk beberapa range; tiap hasil = {"values": [...]}, urut sesuai data_filters
+        resp = (
+            self.service().spreadsheets()
+            .values()
+            .batchGetByDataFilter(
+                spreadsheetId=spreadsheet_id,
+                body={"dataFilters": data_filters, "majorDimension": "ROWS"},
+                fields=VALUE_FIELDS,
+            )
+            .execute(num_retries=API_RETRIES)
+        )
+        return [vr.get("valueRange", {}) for vr in resp.get("valueRanges", [])]
+
+    def sheets_by_filter(self, spreadsheet_id: str, data_filters: list, fields: str) -> list:
+        # metadata tab + isi sel (grid data) yang kena filter, dalam satu request
+        resp = (
+            self.service().spreadsheets()
+            .getByDataFilter(
+                spreadsheetId=spreadsheet_id,
+                body={"dataFilters": data_filters, "includeGridData": True},
+                fields=fields,
+            )
+            .execute(num_retries=API_RETRIES)
+        )
+        return resp.get("sheets", [])
+
+
+def grid_range(sheet_gid: int, start_row: int = 0, end_row: int = None, n_cols: int = None) -> dict:
+    # range berbasis GID (0-based, end eksklusif) -> tidak perlu tahu judul tab
+    grid = {"sheetId": int(sheet_gid), "startRowIndex": start_row}
+    if end_row is not None:
+        grid["endRowIndex"] = end_row
+    if n_cols is not None:
+        grid["startColumnIndex"] = 0
+        grid["endColumnIndex"] = n_cols
+    return {"gridRange": grid}
+
+
+class SheetsSource:
+    """Satu tab Google Sheet (spreadsheet_id + GID) yang dibaca lewat Sheets API.
+
+    Range diminta lewat GID (batchGetByDataFilter), jadi tidak ada request
+    tambahan untuk mencari judul tab dan rename tab tidak memutus sync.
+    """
+
+    def __init__(self, client: SheetsClient, spreadsheet_id: str, sheet_gid: int):
+        self.client = client
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_gid = int(sheet_gid)
+        self.name = f"{spreadsheet_id}:{self.sheet_gid}"
+
+    def fetch_layout(self):
+        # header + jumlah baris data di grid (termasuk baris kosong di bawah), satu request
+        sheets = self.client.sheets_by_filter(self.spreadsheet_id, [grid_range(self.sheet_gid, 0, 1)], LAYOUT_FIELDS)
+        if not sheets:
+            return [], 0
+        props = sheets[0].get("properties", {})
+        row_data = (sheets[0].get("data") or [{}])[0].get("rowData") or [{}]
+        header = [cell.get("formattedValue", "") for cell in row_data[0].get("values", [])]
+        while header and header[-1] == "":
+            header.pop()
+        return header, max(0, props.get("gridProperties", {}).get("rowCount", 0) - 1)
+
+    def fetch_rows(self, start_row: int, end_row: int, n_cols: int):
+        # baris data [start_row, end_row) (0-based, tanpa header); baris kosong di
+        # ujung jendela dipotong API, jadi hasilnya bisa lebih pendek
+        data_filter = grid_range(self.sheet_gid, start_row + 1, end_row + 1, n_cols)
+        value_ranges = self.client.values_by_filter(self.spreadsheet_id, [data_filter])
+        return value_ranges[0].get("values", []) if value_ranges else []
+
+    def fetch_tail(self, start_row: int, n_cols: int):
+        # header + baris data mulai start_row (0-based, tanpa header) sampai akhir sheet,
+        # diambil dalam satu request
+        value_ranges = self.client.values_by_filter(self.spreadsheet_id, [
+            grid_range(self.sheet_gid, 0, 1),
+            grid_range(self.sheet_gid, start_row + 1, n_cols=n_cols),
+        ])
+        header = (value_ranges[0].get("values") or [[]])[0] if value_ranges else []
+        rows = value_ranges[1].get("values", []) if len(value_ranges) > 1 else []
+        return header, rows
+
+
+def _trim_values(rows):
+    # tiru perilaku Sheets API: sel kosong di ujung baris & baris kosong di akhir dibuang
+    out = []
+    for r in rows:
+        r = list(r)
+        while r and r[-1] == "":
+            r.pop()
+        out.append(r)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+class LocalSheetSource:
+    """Pengganti SheetsSource yang membaca file CSV lokal (buat dev/test tanpa API)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = f"local:{path}"
+
+    def _read(self):
+        with open(self.path, newline="", encoding="utf-8") as f:
+            return _trim_values(csv.reader(f))
+
+    def fetch_layout(self):
+        values = self._read()
+        if not values:
+            return [], 0
+        return values[0], len(values) - 1
+
+    def fetch_rows(self, start_row: int, end_row: int, n_cols: int):
+        return _trim_values([r[:n_cols] for r in self._read()[start_row + 1:end_row + 1]])
+
+    def fetch_tail(self, start_row: int, n_cols: int):
+        values = self._read()
+        if not values:
+            return [], []
+        return values[0], [r[:n_cols] for r in values[start_row + 1:]]
+
+
+def build_sources(config) -> list:
+    """Daftar sumber dari konfigurasi (st.secrets atau dict hasil baca secrets.toml).
+
+    SOURCES = daftar tab yang digabung, tiap item {spreadsheet_id, gid} atau {csv}.
+    Kalau tidak ada, pakai LOCAL_SHEET_CSV (jalan tanpa Google API) atau
+    SPREADSHEET_ID + SHEET_GID.
+    """
+    configs = config.get("SOURCES")
+    if not configs:
+        if "LOCAL_SHEET_CSV" in config:
+            configs = [{"csv": config["LOCAL_SHEET_CSV"]}]
+        else:
+            configs = [{"spreadsheet_id": config["SPREADSHEET_ID"], "gid": config["SHEET_GID"]}]
+
+    client = None
+    sources = []
+    for item in configs:
+        if "csv" in item:
+            sources.append(LocalSheetSource(item["csv"]))
+            continue
+        if client is None:
+            client = SheetsClient.from_service_account_info(config["gcp_service_account"])
+        sources.append(SheetsSource(client, item["spreadsheet_id"], int(item["gid"])))
+    return sources
@@ -0,0 +1,50 @@
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEADER = ["No", "Created Date", "Services", "Tags", "Company", "Finish Date", "Keterangan"]
+
+
+def make_rows(n_rows: int, start: int = 0):
+    # baris sheet mentah (semua teks), tanggal format export dd/mm/yyyy hh:mm:ss
+    services = ["Issue", "Request", "Question", "Task"]
+    rows = []
+    for i in range(start, start + n_rows):
+        day = 1 + i % 28
+        month = 1 + (i // 28) % 12
+        rows.append([
+            str(i + 1),
+            f"{day:02d}/{month:02d}/2023 {i % 24:02d}:15:00",
+            services[i % 4],
+            f"Tag {i % 7}",
+            f"PT Company {i % 13}",
+            f"{day:02d}/{month:02d}/2023 23:59:00" if i % 5 else "",
+            "catatan" if i % 3 == 0 else "",
+        ])
+    return rows
+
+
+def write_sheet(path, rows, header=HEADER):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    # cache query di-key per versi data; tiap test membuat Dataset sendiri
+    from query import clear_caches
+    clear_caches()
+    yield
+    clear_caches()
+
+
+@pytest.fixture
+def sheet_csv(tmp_path):
+    return write_sheet(tmp_path / "tiket.csv", make_rows(250))
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from dataset import Dataset, PostingIndex
+
+
+def index_of(values):
+    series = pd.Series(values, dtype="category")
+    return PostingIndex(series, series.cat.codes.to_numpy())
+
+
+def test_search_prefix_before_contains():
+    index = index_of(["Beta Alpha", "Alphabet", "Gamma"])
+    assert index.search("alpha") == ["Alphabet", "Beta Alpha"]
+    assert index.search("") == []
+
+
+def test_search_typo_with_case_duplicates():
+    # nama yang sama kalau huruf kecil semua tidak boleh bikin pencarian mirip gagal
+    index = index_of(["PT Sinar Jaya", "pt sinar jaya", "Koperasi Makmur"])
+    assert sorted(index.search("sinar jayaa")) == ["PT Sinar Jaya", "pt sinar jaya"]
+
+
+def test_search_respects_allowed():
+    index = index_of(["PT Sinar Jaya", "pt sinar jaya", "Koperasi Makmur"])
+    allowed = np.array([name != "pt sinar jaya" for name in index.names])
+    assert index.search("sinar", allowed=allowed) == ["PT Sinar Jaya"]
+    assert index.search("sinar jayaa", allowed=allowed) == ["PT Sinar Jaya"]
+
+
+def resolution_frame(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    created = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60 * 24, n), unit="h")
+    finish = created + pd.to_timedelta(rng.integers(-48, 24 * 20, n), unit="h")
+    finish = pd.Series(finish).where(rng.random(n) > 0.2)
+    return pd.DataFrame({
+        "Created Date": created,
+        "Finish Date": finish.to_numpy(),
+        "Services": pd.Categorical(rng.choice(["Issue", "Request"], n)),
+        "Tags": pd.Categorical(rng.choice(["Login", "Email", "VPN"], n)),
+        "Company": pd.Categorical(rng.choice(["PT A", "PT B"], n)),
+    })
+
+
+def brute_backlog(df, days, service=None):
+    # tiket terbuka di akhir tiap hari: sudah dibuat, dan belum selesai (Finish Date
+    # sebelum Created Date = selesai saat dibuat)
+    if service is not None:
+        df = df[df["Services"] == service]
+    closed_at = df["Finish Date"].where(df["Finish Date"].isna() | (df["Finish Date"] >= df["Created Date"]),
+                                        df["Created Date"])
+    out = []
+    for day in days:
+        day_end = day + pd.Timedelta(days=1)
+        opened = df["Created Date"] < day_end
+        still_open = closed_at.isna() | (closed_at >= day_end)
+        out.append(int((opened & still_open).sum()))
+    return out
+
+
+def test_backlog_matches_brute_force():
+    df = resolution_frame()
+    dataset = Dataset(df, 1)
+    start, end = pd.Timestamp("2024-01-10"), pd.Timestamp("2024-03-20")
+    backlog = dataset.resolution.backlog(start, end)
+    assert list(backlog.index) == list(pd.date_range(start, end - pd.Timedelta(days=1)))
+    assert backlog.tolist() == brute_backlog(df, backlog.index)
+
+    code = dataset.code_of("Services", "Issue")
+    filtered = dataset.resolution.backlog(start, end, {"Services": code})
+    assert filtered.tolist() == brute_backlog(df, filtered.index, "Issue")
+
+
+def test_finish_before_created_is_closed_everywhere():
+    df = pd.DataFrame({
+        "Created Date": pd.to_datetime(["2024-01-01 10:00", "2024-01-01 12:00"]),
+        "Finish Date": pd.to_datetime(["2024-01-01 08:00", pd.NaT]),
+    })
+    resolution = Dataset(df, 1).resolution
+    assert resolution.hours[0] == 0 and np.isnan(resolution.hours[1])
+    assert resolution.backlog(pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02")).tolist() == [1]
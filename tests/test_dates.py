@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from dates import parse_dates
+
+
+def parsed(values):
+    result, bad = parse_dates(pd.Series(values, dtype=object))
+    return list(result), list(bad)
+
+
+def test_day_first_and_iso():
+    result, bad = parsed(["07/03/2024 09:15:00", "7/3/2024", "2024-03-07 09:15", "2024-03-07"])
+    assert result == [pd.Timestamp("2024-03-07 09:15"), pd.Timestamp("2024-03-07"),
+                      pd.Timestamp("2024-03-07 09:15"), pd.Timestamp("2024-03-07")]
+    assert bad == [False] * 4
+
+
+def test_empty_and_invalid():
+    result, bad = parsed(["", None, "31/02/2024", "bukan tanggal", "29/02/2024"])
+    assert pd.isna(result[0]) and pd.isna(result[1]) and pd.isna(result[2]) and pd.isna(result[3])
+    assert result[4] == pd.Timestamp("2024-02-29")
+    assert bad == [False, False, True, True, False]
+
+
+def test_timezone_aware_values_become_utc():
+    result, bad = parsed(["2024-03-07T09:15:00Z", "2024-03-07T09:15:00+07:00",
+                          "07/03/2024 09:15:00 +0700", "2024-03-07 09:15"])
+    assert result == [pd.Timestamp("2024-03-07 09:15"), pd.Timestamp("2024-03-07 02:15"),
+                      pd.Timestamp("2024-03-07 02:15"), pd.Timestamp("2024-03-07 09:15")]
+    assert bad == [False] * 4
+
+
+def test_result_dtype_and_index():
+    series = pd.Series(["01/01/2023 00:00:00"] * 3, index=[5, 6, 7], name="Created Date")
+    result, bad = parse_dates(series)
+    assert result.dtype == np.dtype("datetime64[ns]")
+    assert list(result.index) == [5, 6, 7] and result.name == "Created Date"
+    assert not bad.any()
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from conftest import HEADER, make_rows
+from dataset import Dataset
+from export import export_report, parse_args, slug
+from loader import rows_to_frame
+from query import date_window
+
+
+def dataset():
+    return Dataset(rows_to_frame(HEADER, make_rows(400)), 1)
+
+
+def read(out_dir, name):
+    return pd.read_csv(out_dir / f"{name}.csv")
+
+
+def test_search_applies_to_every_output(tmp_path):
+    ds = dataset()
+    start, end = date_window("Per Tahun", year=2023, months=list(range(1, 13)))
+    written = export_report(ds, str(tmp_path), "Per Tahun", start, end, service="Issue", search="catatan")
+
+    tiket = read(tmp_path, "tiket")
+    assert len(tiket) == written["tiket.csv"] > 0
+    assert (tiket["Keterangan"] == "catatan").all()
+    assert read(tmp_path, "services")["Jumlah Tiket"].sum() == len(tiket)
+    assert read(tmp_path, "deret_waktu")["Jumlah Tiket"].sum() == len(tiket)
+    expected = tiket["Company"].value_counts()
+    top = read(tmp_path, "top_company").set_index("Company")["Jumlah Tiket"]
+    assert (top == expected[top.index]).all()
+
+
+def test_without_search_matches_all_rows(tmp_path):
+    ds = dataset()
+    start, end = date_window("Per Tahun", year=2023, months=list(range(1, 13)))
+    export_report(ds, str(tmp_path), "Per Tahun", start, end)
+    tiket = read(tmp_path, "tiket")
+    assert len(tiket) == 400
+    assert read(tmp_path, "services")["Jumlah Tiket"].sum() == 400
+    assert read(tmp_path, "deret_waktu")["Jumlah Tiket"].sum() == 400
+
+
+def test_slug_is_unique_per_company():
+    names = ["PT A.B", "PT A-B", "pt a b", "PT A B", "", "!!!"]
+    slugs = [slug(name) for name in names]
+    assert len(set(slugs)) == len(names)
+    assert slug("PT A.B") == slug("PT A.B")
+    assert slug("PT Maju Jaya").startswith("pt-maju-jaya-")
+
+
+@pytest.mark.parametrize("argv", [["--month", "13"], ["--month", "0"], ["--months", "1,13"], ["--months", "x"]])
+def test_invalid_months_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(["--mode", "Per Bulan", "--year", "2024"] + argv)
+    assert exit_info.value.code == 2
+    assert "--month" in capsys.readouterr().err
@@ -0,0 +1,241 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from conftest import HEADER, make_rows, write_sheet
+from loader import DatasetHolder, SheetGroup, SheetSync, rows_to_frame
+from sheets import LocalSheetSource
+
+
+class FlakySource(LocalSheetSource):
+    """LocalSheetSource yang gagal sekali saat membaca jendela baris ke-`fail_at`."""
+
+    def __init__(self, path, fail_at):
+        super().__init__(path)
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def fetch_rows(self, start_row, end_row, n_cols):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise RuntimeError("jendela gagal")
+        return super().fetch_rows(start_row, end_row, n_cols)
+
+
+def test_full_load_matches_single_frame(sheet_csv):
+    sync = SheetSync(LocalSheetSource(sheet_csv), chunk_rows=40, workers=3)
+    df = sync.sync()
+    pd.testing.assert_frame_equal(df, rows_to_frame(HEADER, make_rows(250)))
+    assert sync.n_rows == 250
+
+
+def test_failed_cold_start_is_retried(sheet_csv):
+    source = FlakySource(sheet_csv, fail_at=2)
+    holder = DatasetHolder(SheetSync(source, chunk_rows=40, workers=1))
+    with pytest.raises(RuntimeError):
+        holder.get()
+    assert not holder.sync.loaded
+    assert holder.sync.synced_at == 0.0
+    # percobaan berikutnya langsung load ulang, bukan menyajikan Dataset kosong
+    assert len(holder.get().df) == 250
+
+
+def test_failed_full_reload_keeps_previous_state(tmp_path):
+    path = write_sheet(tmp_path / "tiket.csv", make_rows(250))
+    source = FlakySource(path, fail_at=0)
+    sync = SheetSync(source, chunk_rows=40, workers=1)
+    before = sync.sync().copy()
+
+    source.calls, source.fail_at = 0, 2
+    with pytest.raises(RuntimeError):
+        sync.sync(full=True)
+    pd.testing.assert_frame_equal(sync.df, before)
+
+    # sync incremental setelah reload gagal tetap memakai kamus yang lengkap
+    write_sheet(path, make_rows(251))
+    df = sync.sync()
+    assert len(df) == 251
+    assert df["Company"].notna().all()
+
+
+def test_snapshot_round_trip_keeps_dtypes(tmp_path, sheet_csv):
+    sync = SheetSync(LocalSheetSource(sheet_csv))
+    df = sync.sync()
+    path = str(tmp_path / "tiket.arrow")
+    sync.save_snapshot(path)
+
+    restored = SheetSync(LocalSheetSource(sheet_csv))
+    assert restored.restore_snapshot(path)
+    pd.testing.assert_frame_equal(restored.df, df)
+    assert restored.df["Keterangan"].dtype == object
+    assert restored.df["Keterangan"].tolist() == df["Keterangan"].tolist()
+
+    # sync incremental di atas snapshot sama dengan load penuh
+    write_sheet(sheet_csv, make_rows(260))
+    appended = restored.sync()
+    expected = SheetSync(LocalSheetSource(sheet_csv)).sync()
+    pd.testing.assert_frame_equal(appended, expected)
+
+
+def test_inserted_row_triggers_full_load(tmp_path):
+    rows = make_rows(100)
+    path = write_sheet(tmp_path / "tiket.csv", rows)
+    sync = SheetSync(LocalSheetSource(path), tail_window=10, chunk_rows=40, workers=1)
+    sync.sync()
+
+    # baris disisipkan di tengah sekaligus ada tiket baru di bawah
+    extra = make_rows(2, start=500)
+    changed = rows[:20] + [extra[0]] + rows[20:] + [extra[1]]
+    write_sheet(path, changed)
+    df = sync.sync()
+    pd.testing.assert_frame_equal(df, rows_to_frame(HEADER, changed))
+
+
+def test_background_refresh_reconciles_old_rows(tmp_path):
+    rows = make_rows(100)
+    path = write_sheet(tmp_path / "tiket.csv", rows)
+    snapshot = str(tmp_path / "tiket.arrow")
+    sync = SheetSync(LocalSheetSource(path), tail_window=10)
+    sync.sync()
+    sync.save_snapshot(snapshot)
+
+    # Finish Date tiket lama diisi: di luar jendela bawah, sync incremental tidak melihatnya
+    rows[0] = list(rows[0])
+    rows[0][5] = "05/01/2023 10:00:00"
+    write_sheet(path, rows)
+    assert pd.isna(sync.sync().loc[0, "Finish Date"])
+
+    # restart: snapshot dipulihkan, refresh background pertama jadi full load
+    restored = SheetSync(LocalSheetSource(path), tail_window=10)
+    assert restored.restore_snapshot(snapshot)
+    holder = DatasetHolder(restored, refresh_interval=0.01)
+    holder.start()
+    try:
+        deadline = time.time() + 5
+        while pd.isna(holder.get().df.loc[0, "Finish Date"]) and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        holder.stop()
+    assert holder.get().df.loc[0, "Finish Date"] == pd.Timestamp("2023-01-05 10:00")
+    assert restored.full_synced_at > 0
+
+
+class SlowSource(LocalSheetSource):
+    """LocalSheetSource yang menahan fetch_tail sampai `release` di-set."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def fetch_tail(self, start_row, n_cols):
+        self.started.set()
+        self.release.wait(5)
+        return super().fetch_tail(start_row, n_cols)
+
+
+def test_full_refresh_does_not_join_incremental(sheet_csv):
+    source = SlowSource(sheet_csv)
+    sync = SheetSync(source, tail_window=10)
+    holder = DatasetHolder(sync)
+    holder.get()
+    full_before = sync.full_synced_at
+
+    incremental = threading.Thread(target=holder.refresh)
+    incremental.start()
+    assert source.started.wait(5)
+    result = {}
+    full = threading.Thread(target=lambda: result.setdefault("dataset", holder.refresh(full=True)))
+    full.start()
+    time.sleep(0.05)
+    source.release.set()
+    incremental.join(5)
+    full.join(5)
+    assert sync.full_synced_at > full_before
+    assert result["dataset"].version == sync.version
+
+
+class ThreadRecordingSource(LocalSheetSource):
+    """LocalSheetSource yang mencatat thread tiap request (tiap thread = satu service Sheets)."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def fetch_rows(self, start_row, end_row, n_cols):
+        self.threads.add(threading.current_thread())
+        return super().fetch_rows(start_row, end_row, n_cols)
+
+    def fetch_tail(self, start_row, n_cols):
+        self.threads.add(threading.current_thread())
+        return super().fetch_tail(start_row, n_cols)
+
+
+def test_worker_threads_survive_between_refreshes(tmp_path):
+    sources = [ThreadRecordingSource(write_sheet(tmp_path / f"{name}.csv", make_rows(200))) for name in "ab"]
+    group = SheetGroup([SheetSync(source, chunk_rows=20, workers=2) for source in sources], workers=2)
+    for _ in range(3):
+        group.sync(full=True)
+        group.sync()
+    # thread (dan koneksinya) dipakai ulang: paling banyak 2 per sumber + 2 untuk fetch_tail
+    assert len(set.union(*(source.threads for source in sources))) <= 2 * 2 + 2
+
+
+def test_group_combines_sources_and_snapshots(tmp_path):
+    rows_a = make_rows(50)
+    path_a = write_sheet(tmp_path / "a.csv", rows_a)
+    # sumber kedua: nama kolom beda huruf/spasi, tanpa Finish Date, plus kolom tambahan
+    header_b = ["no", "created  date", "SERVICES", "Tags", "Company", "Keterangan", "Prioritas"]
+    rows_b = [[str(i), f"{1 + i:02d}/02/2024 08:00:00", "Task", f"Tag B{i % 2}", "PT Baru", "", "Tinggi"]
+              for i in range(5)]
+    path_b = write_sheet(tmp_path / "b.csv", rows_b, header=header_b)
+
+    group = SheetGroup([SheetSync(LocalSheetSource(path_a)), SheetSync(LocalSheetSource(path_b))])
+    df = group.sync()
+
+    assert list(df.columns) == HEADER + ["Prioritas"]
+    assert len(df) == 55
+    assert df["Finish Date"].dtype == "datetime64[ns]"
+    assert df["Finish Date"].iloc[50:].isna().all()
+    assert df["Prioritas"].iloc[:50].isna().all() and (df["Prioritas"].iloc[50:] == "Tinggi").all()
+    assert df["Created Date"].iloc[50] == pd.Timestamp("2024-02-01 08:00")
+    for col in ("Services", "Tags", "Company"):
+        assert isinstance(df[col].dtype, pd.CategoricalDtype)
+        categories = df[col].cat.categories
+        assert list(categories) == sorted(categories)
+    assert set(df["Company"].cat.categories) == {f"PT Company {i}" for i in range(13)} | {"PT Baru"}
+    assert df["Services"].iloc[50] == "Task" and df["Tags"].iloc[51] == "Tag B1"
+
+    # satu snapshot per sumber, dipulihkan jadi frame gabungan yang sama
+    snapshot = str(tmp_path / "snap" / "tiket.arrow")
+    group.save_snapshot(snapshot)
+    assert len(list((tmp_path / "snap").iterdir())) == 2
+    restored = SheetGroup([SheetSync(LocalSheetSource(path_a)), SheetSync(LocalSheetSource(path_b))])
+    assert restored.restore_snapshot(snapshot)
+    pd.testing.assert_frame_equal(restored.df, df)
+
+    # sumber yang tidak berubah tidak ikut dimuat ulang
+    write_sheet(path_b, rows_b + [["5", "06/02/2024 08:00:00", "Issue", "Tag B0", "PT Baru", "", ""]], header=header_b)
+    version_a = restored.syncs[0].version
+    assert len(restored.sync()) == 56
+    assert restored.syncs[0].version == version_a
+    assert restored.last_delta == 1
+
+
+def test_concurrent_snapshot_writers_do_not_clash(tmp_path, sheet_csv):
+    # dashboard dan export.py --refresh menulis snapshot yang sama
+    syncs = [SheetSync(LocalSheetSource(sheet_csv)) for _ in range(4)]
+    for sync in syncs:
+        sync.sync()
+    path = str(tmp_path / "tiket.arrow")
+    threads = [threading.Thread(target=sync.save_snapshot, args=(path,)) for sync in syncs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["tiket.arrow", "tiket.csv"]
+    restored = SheetSync(LocalSheetSource(sheet_csv))
+    assert restored.restore_snapshot(path)
+    pd.testing.assert_frame_equal(restored.df, syncs[0].df)
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset import Dataset
+from query import (
+    MAX_CHART_POINTS, LRUCache, chart_resolution, chart_series, compare_series, date_window, detail_positions,
+    resolution_stats,
+)
+from test_dataset import resolution_frame
+
+
+def frame(text_dtype):
+    df = pd.DataFrame({
+        "No": pd.Series(["1", "2", "3"], dtype=text_dtype),
+        "Created Date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+        "Services": pd.Categorical(["Issue", "Request", "Issue"]),
+        "Tags": pd.Categorical(["Login", "Email", "Login"]),
+        "Company": pd.Categorical(["PT A", "PT B", "PT C"]),
+        "Keterangan": pd.Series(["server mati", None, "Lupa password"], dtype=text_dtype),
+    })
+    return Dataset(df, 1)
+
+
+@pytest.mark.parametrize("text_dtype", [object, "string", "str"])
+def test_search_covers_text_columns(text_dtype):
+    dataset = frame(text_dtype)
+    start, end = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-04")
+    assert list(detail_positions(dataset, start, end, None, None, search="PASSWORD")) == [2]
+    assert list(detail_positions(dataset, start, end, None, None, search="email")) == [1]
+    assert list(detail_positions(dataset, start, end, None, None, search="tidak ada")) == []
+
+
+@pytest.mark.parametrize("start", ["2021-01-01", "2021-01-04", "2020-02-29"])
+@pytest.mark.parametrize("n_days", [1, 119, 120, 121, 833, 840, 847, 3600, 3660, 3700, 44000])
+def test_chart_resolution_counts_buckets(start, n_days):
+    # resolusi paling halus yang jumlah periodenya (dihitung pandas) <= MAX_CHART_POINTS
+    start = pd.Timestamp(start)
+    days = pd.date_range(start, periods=n_days, freq="D")
+    counts = {freq: days.to_period(period).nunique() for freq, period in
+              (("D", "D"), ("W", "W-SUN"), ("M", "M"), ("Y", "Y"))}
+    expected = next((freq for freq in "DWMY" if counts[freq] <= MAX_CHART_POINTS), "Y")
+    assert chart_resolution(start, start + pd.Timedelta(days=n_days))[0] == expected
+
+
+def test_chart_series_is_not_truncated():
+    dates = pd.date_range("2000-01-01", periods=200, freq="365D")
+    df = pd.DataFrame({
+        "Created Date": dates,
+        "Services": pd.Categorical(["Issue"] * len(dates)),
+        "Tags": pd.Categorical(["Login"] * len(dates)),
+        "Company": pd.Categorical(["PT A"] * len(dates)),
+    })
+    dataset = Dataset(df, 1)
+    series = chart_series(dataset, "Per Hari", pd.Timestamp("2000-01-01"), pd.Timestamp("2200-01-01"))
+    assert series["Jumlah Tiket"].sum() == len(dates)
+
+
+def test_resolution_stats_matches_brute_force():
+    df = resolution_frame()
+    dataset = Dataset(df, 1)
+    start, end = pd.Timestamp("2024-01-15"), pd.Timestamp("2024-02-15")
+    for service in (None, "Issue"):
+        rows = df[(df["Created Date"] >= start) & (df["Created Date"] < end)]
+        if service is not None:
+            rows = rows[rows["Services"] == service]
+        done = rows[rows["Finish Date"].notna()]
+        hours = ((done["Finish Date"] - done["Created Date"]) / pd.Timedelta(hours=1)).clip(lower=0)
+        stats = resolution_stats(dataset, start, end, service)
+        assert stats["tiket"] == len(rows)
+        assert stats["selesai"] == len(done)
+        assert stats["median"] == pytest.approx(np.percentile(hours, 50))
+        assert stats["p90"] == pytest.approx(np.percentile(hours, 90))
+
+
+def compare_dataset():
+    # Login tiap hari, Email hanya tanggal 1 & 3, VPN tidak punya tiket di Januari
+    created = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-01", "2024-01-03", "2024-01-03", "2024-02-01"]
+    tags = ["Login", "Login", "Login", "Email", "Email", "Email", "VPN"]
+    df = pd.DataFrame({
+        "Created Date": pd.to_datetime(created),
+        "Services": pd.Categorical(["Issue"] * len(tags)),
+        "Tags": pd.Categorical(tags),
+        "Company": pd.Categorical(["PT A"] * len(tags)),
+    })
+    return Dataset(df, 1)
+
+
+def test_compare_series_zero_fills_in_selection_order():
+    dataset = compare_dataset()
+    start, end = date_window("Per Bulan", year=2024, month=1)
+    series = compare_series(dataset, "Per Bulan", start, end, "Tags", ("Email", "VPN", "Login"))
+
+    assert list(series.columns) == ["Tanggal", "Tags", "Jumlah Tiket"]
+    # garis ikut urutan pilihan; VPN tanpa tiket di periode ini tidak digambar
+    assert list(dict.fromkeys(series["Tags"])) == ["Email", "Login"]
+    table = series.pivot(index="Tanggal", columns="Tags", values="Jumlah Tiket")
+    assert table.loc[[1, 2, 3], "Email"].tolist() == [1, 0, 2]
+    assert table.loc[[1, 2, 3], "Login"].tolist() == [1, 1, 1]
+
+
+def test_compare_series_limits_and_empty_selection():
+    dataset = compare_dataset()
+    start, end = date_window("Per Bulan", year=2024, month=1)
+    limited = compare_series(dataset, "Per Bulan", start, end, "Tags", ("Login", "Email"), max_series=1)
+    assert set(limited["Tags"]) == {"Login"}
+    assert limited["Jumlah Tiket"].sum() == 3
+
+    assert compare_series(dataset, "Per Bulan", start, end, "Tags", ()).empty
+    assert compare_series(dataset, "Per Bulan", start, end, "Tags", ("VPN",)).empty
+
+
+def test_older_version_does_not_clear_cache():
+    cache = LRUCache("test", maxsize=4)
+    assert cache.lookup(2, "a", lambda: "v2") == ("v2", False)
+    # Dataset lama (versi 1) dihitung tanpa cache, entri versi 2 tetap ada
+    assert cache.lookup(1, "a", lambda: "v1") == ("v1", False)
+    assert cache.lookup(1, "a", lambda: "v1") == ("v1", False)
+    assert cache.lookup(2, "a", lambda: "baru") == ("v2", True)
+    # versi baru tetap mengganti isi cache
+    assert cache.lookup(3, "a", lambda: "v3") == ("v3", False)
+    assert cache.stats()["size"] == 1
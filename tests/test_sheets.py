@@ -0,0 +1,71 @@
+import json
+
+import pandas as pd
+from googleapiclient.http import HttpMockSequence
+
+from conftest import HEADER, make_rows
+from loader import SheetSync, rows_to_frame
+from sheets import SheetsClient, SheetsSource
+
+
+def layout(header, n_rows):
+    return {"sheets": [{
+        "properties": {"gridProperties": {"rowCount": n_rows + 1}},
+        "data": [{"rowData": [{"values": [{"formattedValue": h} for h in header] + [{}]}]}],
+    }]}
+
+
+def values(*ranges):
+    return {"valueRanges": [{"valueRange": {"values": rows}} if rows else {"valueRange": {}} for rows in ranges]}
+
+
+def mock_source(*responses):
+    http = HttpMockSequence([({"status": "200"}, json.dumps(body)) for body in responses])
+    return SheetsSource(SheetsClient(http=http), "spreadsheet", 123)
+
+
+def test_full_load_then_incremental_sync():
+    rows = make_rows(30)
+    source = mock_source(
+        layout(HEADER, 30),
+        values(rows[:20]),
+        values(rows[20:]),
+        # sync berikutnya: header + jendela bawah, ada 5 baris baru
+        values([HEADER], make_rows(35)[30 - 10:]),
+    )
+    sync = SheetSync(source, tail_window=10, chunk_rows=20, workers=1)
+
+    df = sync.sync()
+    pd.testing.assert_frame_equal(df, rows_to_frame(HEADER, rows))
+    assert sync.n_rows == 30
+
+    df = sync.sync()
+    pd.testing.assert_frame_equal(df, rows_to_frame(HEADER, make_rows(35)))
+    assert sync.last_delta == 5
+
+
+def test_edited_tail_replaces_window():
+    rows = make_rows(30)
+    edited = [list(r) for r in rows]
+    edited[25][4] = "PT Baru"
+    source = mock_source(layout(HEADER, 30), values(rows), values([HEADER], edited[20:]))
+    sync = SheetSync(source, tail_window=10, chunk_rows=50, workers=1)
+    sync.sync()
+    df = sync.sync()
+    pd.testing.assert_frame_equal(df, rows_to_frame(HEADER, edited), check_categorical=False)
+    assert df.loc[25, "Company"] == "PT Baru"
+
+
+def test_rate_limited_window_is_retried(monkeypatch):
+    # tanpa jeda backoff sungguhan
+    monkeypatch.setattr("googleapiclient.http.time.sleep", lambda seconds: None)
+    rows = make_rows(30)
+    http = HttpMockSequence([
+        ({"status": "200"}, json.dumps(layout(HEADER, 30))),
+        ({"status": "429"}, json.dumps({"error": {"code": 429, "message": "Quota exceeded"}})),
+        ({"status": "503"}, "{}"),
+        ({"status": "200"}, json.dumps(values(rows))),
+    ])
+    source = SheetsSource(SheetsClient(http=http), "spreadsheet", 123)
+    df = SheetSync(source, chunk_rows=50, workers=1).sync()
+    pd.testing.assert_frame_equal(df, rows_to_frame(HEADER, rows))